@@ -0,0 +1,60 @@
+import os
+import time
+
+import grpc
+import pytest
+import requests
+
+from http_pool import SESSION
+from streaming_pb2_grpc import StreamingServiceStub
+
+# Target address; e.g. STREAMING_GRPC_ADDR=unix:/tmp/streaming.sock when the
+# server was started with GRPC_UNIX_SOCKET=/tmp/streaming.sock
+GRPC_ADDR = os.environ.get("STREAMING_GRPC_ADDR", "localhost:50051")
+
+# One keep-alive HTTP/2 connection multiplexed across all tests
+CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 5000),
+    # Private subchannel pool: skips the process-wide pool and its lock
+    ("grpc.use_local_subchannel_pool", 1),
+    # Local service: skip proxy detection
+    ("grpc.enable_http_proxy", 0),
+    # Full-table listings must not hit the 4MB default limit
+    ("grpc.max_receive_message_length", 64 << 20),
+    ("grpc.max_send_message_length", 64 << 20),
+]
+
+# Backoff delays (seconds) while waiting for an HTTP service to answer
+READY_DELAYS = (0.05, 0.1, 0.2, 0.4, 0.8, 1.6)
+
+@pytest.fixture(scope="session", autouse=True)
+def _close_http_session():
+    """Close the shared HTTP session once the whole test run is done"""
+    yield
+    SESSION.close()
+
+@pytest.fixture(scope="session")
+def grpc_stub():
+    """Stub over one channel shared by every gRPC test of the run"""
+    channel = grpc.insecure_channel(GRPC_ADDR, options=CHANNEL_OPTIONS)
+    grpc.channel_ready_future(channel).result(timeout=5)
+    yield StreamingServiceStub(channel)
+    channel.close()
+
+@pytest.fixture(scope="session")
+def wait_for_http():
+    """Poller that blocks until an HTTP endpoint answers, failing fast otherwise"""
+    def wait(url, data=None, headers=None):
+        for delay in READY_DELAYS:
+            try:
+                if data is None:
+                    response = SESSION.get(url, headers=headers, timeout=1)
+                else:
+                    response = SESSION.post(url, data=data, headers=headers, timeout=1)
+                response.raise_for_status()
+                return
+            except requests.exceptions.RequestException:
+                time.sleep(delay)
+        pytest.fail(f"Service at {url} did not become ready")
+    return wait
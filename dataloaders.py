@@ -8,7 +8,7 @@ for the streaming service that loads data from JSON files.
 
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
-from functools import partial
+from functools import partial, wraps
 import asyncio
 from collections import defaultdict
 import json
@@ -16,8 +16,22 @@ import os
 import shutil
 import tempfile
 import atexit
+import sys
+import threading
 import uuid
 
+def _internar(valor):
+    """Interna strings; outros valores (ex.: None vindo do SOAP) passam intactos."""
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+def _sincronizado(metodo):
+    """Executa o método de escrita segurando o lock do carregador."""
+    @wraps(metodo)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return metodo(self, *args, **kwargs)
+    return wrapper
+
 @dataclass
 class Batch:
     """Represents a batch of keys to be loaded"""
@@ -155,6 +169,13 @@ class StreamingDataLoader:
         self.usuarios = []
         self.musicas = []
         self.playlists = []
+        # Agregado mantido incrementalmente pelas operações de escrita
+        self.total_musicas_em_playlists = 0
+        # Incrementada a cada alteração de playlists (invalida caches derivados)
+        self.versao_playlists = 0
+        # O carregador é compartilhado pelas threads dos serviços (REST, GraphQL,
+        # gRPC e workers do waitress): escritas e salvamentos passam por este lock
+        self.lock = threading.RLock()
         self._setup_temp_persistence()
         self._carregar_dados()
         
@@ -203,18 +224,29 @@ class StreamingDataLoader:
         arquivo_usuarios = os.path.join(self.temp_dir, "usuarios.json")
         with open(arquivo_usuarios, 'r', encoding='utf-8') as f:
             self.usuarios = json.load(f)
+        for usuario in self.usuarios:
+            usuario["id"] = sys.intern(usuario["id"])
     
     def _carregar_musicas(self):
         """Carrega músicas do arquivo temporário."""
         arquivo_musicas = os.path.join(self.temp_dir, "musicas.json")
         with open(arquivo_musicas, 'r', encoding='utf-8') as f:
             self.musicas = json.load(f)
+        for musica in self.musicas:
+            musica["id"] = sys.intern(musica["id"])
     
     def _carregar_playlists(self):
         """Carrega playlists do arquivo temporário."""
         arquivo_playlists = os.path.join(self.temp_dir, "playlists.json")
         with open(arquivo_playlists, 'r', encoding='utf-8') as f:
             self.playlists = json.load(f)
+        # IDs internados: cada ID de música aparece em várias playlists, e o
+        # JSON cria uma string nova por ocorrência
+        for playlist in self.playlists:
+            playlist["id"] = sys.intern(playlist["id"])
+            playlist["id_usuario"] = sys.intern(playlist["id_usuario"])
+            playlist["musicas"] = [sys.intern(m) for m in playlist["musicas"]]
+        self.total_musicas_em_playlists = sum(len(p["musicas"]) for p in self.playlists)
     
     def _salvar_usuarios(self):
         """Salva usuários no arquivo temporário."""
@@ -230,6 +262,7 @@ class StreamingDataLoader:
     
     def _salvar_playlists(self):
         """Salva playlists no arquivo temporário."""
+        self.versao_playlists += 1
         arquivo_playlists = os.path.join(self.temp_dir, "playlists.json")
         with open(arquivo_playlists, 'w', encoding='utf-8') as f:
             json.dump(self.playlists, f, ensure_ascii=False, indent=2)
@@ -273,7 +306,7 @@ class StreamingDataLoader:
     def obter_estatisticas(self) -> Dict[str, Any]:
         """Obtém estatísticas do sistema."""
         usuarios_com_playlists = len(set(p["id_usuario"] for p in self.playlists))
-        total_musicas_playlists = sum(len(p["musicas"]) for p in self.playlists)
+        total_musicas_playlists = self.total_musicas_em_playlists
         
         return {
             "total_usuarios": len(self.usuarios),
@@ -287,10 +320,11 @@ class StreamingDataLoader:
 
     # ========== MÉTODOS CRUD - USUÁRIOS ==========
     
+    @_sincronizado
     def criar_usuario(self, nome: str, idade: int) -> Dict[str, Any]:
         """Cria um novo usuário."""
         novo_usuario = {
-            "id": str(uuid.uuid4()),
+            "id": sys.intern(str(uuid.uuid4())),
             "nome": nome,
             "idade": idade
         }
@@ -300,6 +334,7 @@ class StreamingDataLoader:
         
         return novo_usuario
     
+    @_sincronizado
     def atualizar_usuario(self, id_usuario: str, nome: str = None, idade: int = None) -> Optional[Dict[str, Any]]:
         """Atualiza um usuário existente."""
         usuario = self.get_usuario(id_usuario)
@@ -314,6 +349,7 @@ class StreamingDataLoader:
         self._salvar_usuarios()
         return usuario
     
+    @_sincronizado
     def deletar_usuario(self, id_usuario: str) -> bool:
         """Remove um usuário."""
         usuario_index = next((i for i, u in enumerate(self.usuarios) if u["id"] == id_usuario), None)
@@ -324,7 +360,13 @@ class StreamingDataLoader:
         del self.usuarios[usuario_index]
         
         # Remover playlists do usuário
-        self.playlists = [p for p in self.playlists if p["id_usuario"] != id_usuario]
+        playlists_restantes = []
+        for p in self.playlists:
+            if p["id_usuario"] == id_usuario:
+                self.total_musicas_em_playlists -= len(p["musicas"])
+            else:
+                playlists_restantes.append(p)
+        self.playlists = playlists_restantes
         
         self._salvar_usuarios()
         self._salvar_playlists()
@@ -333,10 +375,11 @@ class StreamingDataLoader:
 
     # ========== MÉTODOS CRUD - MÚSICAS ==========
     
+    @_sincronizado
     def criar_musica(self, nome: str, artista: str, duracao_segundos: int) -> Dict[str, Any]:
         """Cria uma nova música."""
         nova_musica = {
-            "id": str(uuid.uuid4()),
+            "id": sys.intern(str(uuid.uuid4())),
             "nome": nome,
             "artista": artista,
             "duracao_segundos": duracao_segundos
@@ -347,6 +390,7 @@ class StreamingDataLoader:
         
         return nova_musica
     
+    @_sincronizado
     def atualizar_musica(self, id_musica: str, nome: str = None, artista: str = None, duracao_segundos: int = None) -> Optional[Dict[str, Any]]:
         """Atualiza uma música existente."""
         musica = self.get_musica(id_musica)
@@ -363,6 +407,7 @@ class StreamingDataLoader:
         self._salvar_musicas()
         return musica
     
+    @_sincronizado
     def deletar_musica(self, id_musica: str) -> bool:
         """Remove uma música."""
         musica_index = next((i for i, m in enumerate(self.musicas) if m["id"] == id_musica), None)
@@ -376,6 +421,7 @@ class StreamingDataLoader:
         for playlist in self.playlists:
             if id_musica in playlist["musicas"]:
                 playlist["musicas"].remove(id_musica)
+                self.total_musicas_em_playlists -= 1
         
         self._salvar_musicas()
         self._salvar_playlists()
@@ -384,23 +430,26 @@ class StreamingDataLoader:
 
     # ========== MÉTODOS CRUD - PLAYLISTS ==========
     
+    @_sincronizado
     def criar_playlist(self, nome: str, id_usuario: str, musicas: List[str] = None) -> Dict[str, Any]:
         """Cria uma nova playlist."""
         if musicas is None:
             musicas = []
         
         nova_playlist = {
-            "id": str(uuid.uuid4()),
+            "id": sys.intern(str(uuid.uuid4())),
             "nome": nome,
-            "id_usuario": id_usuario,
-            "musicas": musicas
+            "id_usuario": _internar(id_usuario),
+            "musicas": [_internar(m) for m in musicas]
         }
         
         self.playlists.append(nova_playlist)
+        self.total_musicas_em_playlists += len(musicas)
         self._salvar_playlists()
         
         return nova_playlist
     
+    @_sincronizado
     def atualizar_playlist(self, id_playlist: str, nome: str = None, musicas: List[str] = None) -> Optional[Dict[str, Any]]:
         """Atualiza uma playlist existente."""
         playlist = self.get_playlist(id_playlist)
@@ -410,17 +459,20 @@ class StreamingDataLoader:
         if nome is not None:
             playlist["nome"] = nome
         if musicas is not None:
-            playlist["musicas"] = musicas
+            self.total_musicas_em_playlists += len(musicas) - len(playlist["musicas"])
+            playlist["musicas"] = [_internar(m) for m in musicas]
         
         self._salvar_playlists()
         return playlist
     
+    @_sincronizado
     def deletar_playlist(self, id_playlist: str) -> bool:
         """Remove uma playlist."""
         playlist_index = next((i for i, p in enumerate(self.playlists) if p["id"] == id_playlist), None)
         if playlist_index is None:
             return False
         
+        self.total_musicas_em_playlists -= len(self.playlists[playlist_index]["musicas"])
         del self.playlists[playlist_index]
         self._salvar_playlists()
         
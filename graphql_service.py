@@ -9,6 +9,7 @@ Padronizado seguindo convenções Python e boas práticas de desenvolvimento.
 import strawberry
 from strawberry.fastapi import GraphQLRouter
 from strawberry.schema.config import StrawberryConfig
+from strawberry.extensions import ParserCache, ValidationCache
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
@@ -436,11 +437,19 @@ class Mutation:
 
 # ========== SCHEMA GRAPHQL ==========
 
+# Documentos repetidos reaproveitam o AST e a validação já feitos
+# (chave: texto da query), pulando as duas primeiras etapas do pipeline
+TAMANHO_CACHE_DOCUMENTOS = 256
+
 # Configuração para manter snake_case em vez de conversão automática para camelCase
 schema = strawberry.Schema(
     query=Query, 
     mutation=Mutation,
-    config=StrawberryConfig(auto_camel_case=False)
+    config=StrawberryConfig(auto_camel_case=False),
+    extensions=[
+        ParserCache(maxsize=TAMANHO_CACHE_DOCUMENTOS),
+        ValidationCache(maxsize=TAMANHO_CACHE_DOCUMENTOS),
+    ]
 )
 
 # ========== CONFIGURAÇÃO FASTAPI ==========
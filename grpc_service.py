@@ -2,6 +2,7 @@
 from concurrent import futures
 import grpc
 import json
+import os
 import time
 from grpc_reflection.v1alpha import reflection
 
@@ -445,8 +446,15 @@ class StreamingService(streaming_pb2_grpc.StreamingServiceServicer):
             message=f"Playlist '{playlist.get('nome')}' removida com sucesso"
         )
 
-def servir(porta=50051):
-    """Inicia o servidor gRPC na porta especificada."""
+def servir(porta=50051, socket_unix=None):
+    """Inicia o servidor gRPC na porta especificada.
+
+    Se ``socket_unix`` (ou a variável GRPC_UNIX_SOCKET) indicar um caminho,
+    o servidor também escuta nesse Unix domain socket, evitando a pilha TCP
+    para clientes locais.
+    """
+    if socket_unix is None:
+        socket_unix = os.environ.get('GRPC_UNIX_SOCKET')
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
     streaming_pb2_grpc.add_StreamingServiceServicer_to_server(StreamingService(), server)
     
@@ -458,8 +466,12 @@ def servir(porta=50051):
     reflection.enable_server_reflection(SERVICE_NAMES, server)
     
     server.add_insecure_port(f'[::]:{porta}')
+    if socket_unix:
+        server.add_insecure_port(f'unix:{socket_unix}')
     server.start()
     print(f"Servidor gRPC iniciado na porta {porta}.")
+    if socket_unix:
+        print(f"Servidor gRPC também escutando em unix:{socket_unix}.")
     server.wait_for_termination()
 
 if __name__ == '__main__':
@@ -0,0 +1,11 @@
+"""
+Pooled HTTP session shared by the REST, GraphQL and SOAP test modules
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Keep-alive connections reused by every request of the test run;
+# closed once at the end of the run by the fixture in conftest.py
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
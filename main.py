@@ -55,6 +55,7 @@ def verificar_dependencias():
         ("grpcio-reflection", "grpcio-reflection==1.59.0"),
         ("spyne", "spyne==2.14.0"),
         ("lxml", "lxml==4.9.3"),
+        ("waitress", "waitress>=2.1.0"),
         ("requests", "requests>=2.25.0"),  # Para testes de carga
         ("aiohttp", "aiohttp>=3.8.0")  # Para testes async
     ]
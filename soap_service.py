@@ -23,8 +23,28 @@ from spyne.protocol.soap import Soap11
 from spyne.server.wsgi import WsgiApplication
 from wsgiref.simple_server import make_server
 import json
+import logging
+import os
+import re
+import sys
 from typing import List, Dict, Optional
-import traceback
+from urllib.parse import parse_qsl
+
+logger = logging.getLogger(__name__)
+
+# Servidor WSGI com múltiplas threads (wsgiref atende uma requisição por vez)
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+# Serializador JSON do fast-path: orjson já devolve bytes; json como fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Usar dados reais gerados em data/
 from dataloaders import get_data_loader
@@ -37,6 +57,24 @@ def get_loader():
 # SOAP agora usa delegação total para o data_loader
 # Não precisa mais de cópias locais ou listas temporárias
 
+def calcular_estatisticas() -> Dict:
+    """Calcula as estatísticas expostas pelo SOAP e pelo fast-path JSON."""
+    loader = get_loader()
+    total_playlists = len(loader.playlists)
+    
+    media_musicas_por_playlist = 0.0
+    if total_playlists > 0:
+        media_musicas_por_playlist = loader.total_musicas_em_playlists / total_playlists
+    
+    return {
+        "total_usuarios": len(loader.usuarios),
+        "total_musicas": len(loader.musicas),
+        "total_playlists": total_playlists,
+        "media_musicas_por_playlist": media_musicas_por_playlist,
+        "tecnologia": "SOAP",
+        "framework": "Spyne",
+    }
+
 # Modelos SOAP padronizados
 class Usuario(ComplexModel):
     """Modelo de usuário para SOAP."""
@@ -57,6 +95,29 @@ class Playlist(ComplexModel):
     nome = Unicode
     usuario = Unicode
 
+# Espelho dos modelos Playlist: reconstruído apenas quando o data_loader
+# altera as playlists (versao_playlists), em vez de a cada listagem.
+_cache_playlists = (None, [], {})
+
+def obter_modelos_playlists():
+    """Retorna pares (playlist, modelo) e os modelos agrupados por usuário."""
+    global _cache_playlists
+    loader = get_loader()
+    versao, pares, por_usuario = _cache_playlists
+    if versao != loader.versao_playlists:
+        # Reconstrução sob o lock do carregador: nenhuma escrita concorrente
+        # altera as playlists no meio da cópia
+        with loader.lock:
+            versao = loader.versao_playlists
+            pares = []
+            por_usuario = {}
+            for p in loader.playlists:
+                modelo = Playlist(id=p["id"], nome=p["nome"], usuario=p["id_usuario"])
+                pares.append((p, modelo))
+                por_usuario.setdefault(p["id_usuario"], []).append(modelo)
+            _cache_playlists = (versao, pares, por_usuario)
+    return pares, por_usuario
+
 class Estatisticas(ComplexModel):
     """Modelo de estatísticas para SOAP."""
     total_usuarios = Integer
@@ -69,34 +130,33 @@ class Estatisticas(ComplexModel):
 class StreamingService(ServiceBase):
     """Serviço SOAP para plataforma de streaming."""
     
-    @rpc(_returns=Array(Usuario))
+    # As listagens usam Iterable + yield para o Spyne serializar item a item,
+    # sem materializar uma lista intermediária de ComplexModels.
+    @rpc(_returns=Iterable(Usuario))
     def listar_usuarios(ctx):
         """Lista todos os usuários do sistema."""
-        return [Usuario(**usuario) for usuario in get_loader().usuarios]
+        for usuario in get_loader().usuarios:
+            yield Usuario(**usuario)
     
-    @rpc(_returns=Array(Musica))
+    @rpc(_returns=Iterable(Musica))
     def listar_musicas(ctx):
         """Lista todas as músicas do sistema."""
-        return [Musica(id=m["id"], nome=m["nome"], artista=m["artista"], 
-                      duracao=m["duracao_segundos"]) 
-                for m in get_loader().musicas]
+        for m in get_loader().musicas:
+            yield Musica(id=m["id"], nome=m["nome"], artista=m["artista"],
+                         duracao=m["duracao_segundos"])
     
-    @rpc(_returns=Array(Playlist))
+    @rpc(_returns=Iterable(Playlist))
     def listar_playlists(ctx):
         """Lista todas as playlists do sistema."""
-        playlists = []
-        for p in get_loader().playlists:
-            playlists.append(Playlist(id=p["id"], nome=p["nome"], usuario=p["id_usuario"]))
-        return playlists
+        pares, _ = obter_modelos_playlists()
+        for _, modelo in pares:
+            yield modelo
 
-    @rpc(Unicode, _returns=Array(Playlist))
+    @rpc(Unicode, _returns=Iterable(Playlist))
     def listar_playlists_usuario(ctx, id_usuario):
         """Lista playlists de um usuário específico."""
-        result_playlists = []
-        for p in get_loader().playlists:
-            if p["id_usuario"] == id_usuario:
-                result_playlists.append(Playlist(id=p["id"], nome=p["nome"], usuario=p["id_usuario"]))
-        return result_playlists
+        _, por_usuario = obter_modelos_playlists()
+        return por_usuario.get(id_usuario, [])
 
     @rpc(Unicode, _returns=Array(Musica))
     def listar_musicas_playlist(ctx, id_playlist):
@@ -115,14 +175,13 @@ class StreamingService(ServiceBase):
                 ))
         return musicas_da_playlist
 
-    @rpc(Unicode, _returns=Array(Playlist))
+    @rpc(Unicode, _returns=Iterable(Playlist))
     def listar_playlists_com_musica(ctx, id_musica):
         """Lista playlists que contêm uma música específica."""
-        result_playlists = []
-        for p in get_loader().playlists:
+        pares, _ = obter_modelos_playlists()
+        for p, modelo in pares:
             if id_musica in p["musicas"]:
-                result_playlists.append(Playlist(id=p["id"], nome=p["nome"], usuario=p["id_usuario"]))
-        return result_playlists
+                yield modelo
     
     @rpc(Unicode, _returns=Usuario)
     def obter_usuario(ctx, id_usuario):
@@ -163,23 +222,7 @@ class StreamingService(ServiceBase):
     @rpc(_returns=Estatisticas)
     def obter_estatisticas(ctx):
         """Retorna estatísticas do serviço."""
-        total_playlists = len(get_loader().playlists)
-        total_musicas = len(get_loader().musicas)
-        total_usuarios = len(get_loader().usuarios)
-        
-        media_musicas_por_playlist = 0.0
-        if total_playlists > 0:
-            total_musicas_em_playlists = sum(len(p.get("musicas", [])) for p in get_loader().playlists)
-            media_musicas_por_playlist = total_musicas_em_playlists / total_playlists
-        
-        return Estatisticas(
-            total_usuarios=total_usuarios,
-            total_musicas=total_musicas,
-            total_playlists=total_playlists,
-            media_musicas_por_playlist=media_musicas_por_playlist,
-            tecnologia="SOAP",
-            framework="Spyne"
-        )
+        return Estatisticas(**calcular_estatisticas())
 
     # ========== UPDATE AND DELETE OPERATIONS ==========
 
@@ -228,52 +271,11 @@ class StreamingService(ServiceBase):
     @rpc(_returns=Array(Playlist))
     def listar_playlists_simples(ctx):
         """Lista playlists sem o campo musicas para teste."""
-        playlists = []
-        for p in get_loader().playlists[:5]:  # Apenas 5 para teste
-            playlists.append(Playlist(id=p["id"], nome=p["nome"], usuario=p["id_usuario"]))
-        return playlists
-
-def criar_aplicacao_soap():
-    """Cria a aplicação SOAP."""
-    application = Application(
-        [StreamingService],
-        tns='http://streaming.soap.service',
-        in_protocol=Soap11(validator='lxml'),
-        out_protocol=Soap11(),
-        name='StreamingService'
-    )
-    return application
+        pares, _ = obter_modelos_playlists()
+        return [modelo for _, modelo in pares[:5]]  # Apenas 5 para teste
 
-def manipular_cors_e_roteamento(environ, start_response):
-    """Manipula CORS e roteamento de requisições."""
-    method = environ['REQUEST_METHOD']
-    path = environ.get('PATH_INFO', '/')
-    
-    # Log request details
-    print(f"\nSOAP Request:")
-    print(f"Method: {method}")
-    print(f"Path: {path}")
-    print(f"Headers: {dict(environ)}")
-    
-    # Normalizar path para SOAP
-    if path.startswith('/soap'):
-        environ['PATH_INFO'] = path[len('/soap'):] or '/'
-        path = environ['PATH_INFO']
-    
-    query = environ.get('QUERY_STRING', '')
-    
-    # Preflight CORS
-    if method == 'OPTIONS':
-        start_response('200 OK', [
-            ('Access-Control-Allow-Origin', '*'),
-            ('Access-Control-Allow-Methods', 'GET, POST, OPTIONS'),
-            ('Access-Control-Allow-Headers', 'Content-Type, SOAPAction')
-        ])
-        return [b'OK']
-    
-    # Página informativa
-    if method == 'GET' and 'wsdl' not in query.lower():
-        html = """
+# Página informativa servida em GET sem ?wsdl (codificada uma única vez)
+_INFO_HTML = """
         <!DOCTYPE html>
         <html>
         <head>
@@ -314,54 +316,203 @@ def manipular_cors_e_roteamento(environ, start_response):
                 <li>deletar_playlist</li>
             </ul>
             <p>Para ver o WSDL, acesse: <a href="?wsdl">?wsdl</a></p>
+            <p>Consultas em JSON (sem envelope SOAP): <code>/soap/fast/&lt;operacao&gt;</code></p>
         </body>
         </html>
         """
-        start_response('200 OK', [('Content-Type', 'text/html')])
-        return [html.encode('utf-8')]
+_INFO_HTML_BYTES = _INFO_HTML.encode('utf-8')
+
+# Roteamento: prefixo removido do PATH_INFO e detecção de ?wsdl sem .lower()
+_PREFIXO_SOAP = '/soap'
+_TAMANHO_PREFIXO_SOAP = len(_PREFIXO_SOAP)
+_WSDL_QUERY_RE = re.compile('wsdl', re.IGNORECASE)
+
+# Headers CORS fixos, anexados a todas as respostas
+_CORS_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, POST, OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type, SOAPAction'),
+)
+
+# Endereço publicado no soap:address do WSDL (configurável por ambiente).
+# Atrás de ngrok/proxy, defina-o com a URL pública antes de iniciar o serviço,
+# ex.: SOAP_PUBLIC_URL=https://<tunel>.ngrok-free.app/soap
+SOAP_PUBLIC_URL = os.environ.get('SOAP_PUBLIC_URL', 'http://localhost:8004/soap')
+
+def criar_aplicacao_soap(validate=None):
+    """Cria a aplicação SOAP.
+
+    Os envelopes são validados contra o XSD (lxml) por padrão; a validação
+    pode ser desligada com ``validate=False`` ou ``SOAP_VALIDATE=0``.
+    """
+    if validate is None:
+        validate = os.environ.get('SOAP_VALIDATE', '1').lower() not in ('0', 'false', 'no')
+    application = Application(
+        [StreamingService],
+        tns='http://streaming.soap.service',
+        in_protocol=Soap11(validator='lxml' if validate else None),
+        out_protocol=Soap11(),
+        name='StreamingService'
+    )
+    return application
+
+# Uma única WsgiApplication para todo o processo, com o WSDL gerado uma vez
+_WSGI_APP = WsgiApplication(criar_aplicacao_soap())
+_WSGI_APP.doc.wsdl11.build_interface_document(SOAP_PUBLIC_URL)
+_WSDL_BYTES = _WSGI_APP.doc.wsdl11.get_interface_document()
+
+# ========== FAST-PATH JSON ==========
+# As consultas do serviço também são servidas em JSON em /fast/<operacao>
+# (parâmetros na query string), sem envelope XML nem serialização do Spyne.
+# Pensado para chamadores internos; operações de escrita continuam no SOAP.
+
+_PREFIXO_FAST = '/fast/'
+_TAMANHO_PREFIXO_FAST = len(_PREFIXO_FAST)
+
+def _usuario_json(u):
+    return {"id": u["id"], "nome": u["nome"], "idade": u["idade"]}
+
+def _musica_json(m):
+    return {"id": m["id"], "nome": m["nome"], "artista": m["artista"],
+            "duracao": m["duracao_segundos"]}
+
+def _playlist_json(p):
+    return {"id": p["id"], "nome": p["nome"], "usuario": p["id_usuario"]}
+
+def _fast_obter_usuario(id_usuario):
+    usuario = get_loader().get_usuario(id_usuario)
+    return _usuario_json(usuario) if usuario else None
+
+def _fast_obter_playlist(id_playlist):
+    playlist = get_loader().get_playlist(id_playlist)
+    return _playlist_json(playlist) if playlist else None
+
+def _fast_listar_playlists_usuario(id_usuario):
+    loader = get_loader()
+    if not loader.get_usuario(id_usuario):
+        return None
+    return [_playlist_json(p) for p in loader.listar_playlists_usuario(id_usuario)]
+
+def _fast_listar_musicas_playlist(id_playlist):
+    loader = get_loader()
+    if not loader.get_playlist(id_playlist):
+        return None
+    return [_musica_json(m) for m in loader.listar_musicas_playlist(id_playlist)]
+
+# operacao -> (função, parâmetros obrigatórios da query string)
+_OPERACOES_FAST = {
+    "listar_usuarios": (
+        lambda: [_usuario_json(u) for u in get_loader().usuarios], ()),
+    "listar_musicas": (
+        lambda: [_musica_json(m) for m in get_loader().musicas], ()),
+    "listar_playlists": (
+        lambda: [_playlist_json(p) for p in get_loader().playlists], ()),
+    "listar_playlists_usuario": (_fast_listar_playlists_usuario, ("id_usuario",)),
+    "listar_musicas_playlist": (_fast_listar_musicas_playlist, ("id_playlist",)),
+    "listar_playlists_com_musica": (
+        lambda id_musica: [_playlist_json(p) for p in get_loader().listar_playlists_com_musica(id_musica)],
+        ("id_musica",)),
+    "obter_usuario": (_fast_obter_usuario, ("id_usuario",)),
+    "obter_playlist": (_fast_obter_playlist, ("id_playlist",)),
+    "obter_estatisticas": (calcular_estatisticas, ()),
+}
+
+def _responder_json(start_response, status, conteudo):
+    """Serializa ``conteudo`` em JSON e envia a resposta com headers CORS."""
+    if ORJSON_AVAILABLE:
+        corpo = orjson.dumps(conteudo)
+    else:
+        corpo = json.dumps(conteudo, ensure_ascii=False).encode('utf-8')
+    start_response(status, [
+        ('Content-Type', 'application/json; charset=utf-8'),
+        ('Content-Length', str(len(corpo))),
+        *_CORS_HEADERS
+    ])
+    return [corpo]
+
+def manipular_fast(environ, start_response):
+    """Atende /fast/<operacao> em JSON usando diretamente o data_loader."""
+    if environ['REQUEST_METHOD'] != 'GET':
+        return _responder_json(start_response, '405 Method Not Allowed',
+                               {"erro": "Use GET no fast-path JSON"})
+    
+    operacao = environ['PATH_INFO'][_TAMANHO_PREFIXO_FAST:]
+    entrada = _OPERACOES_FAST.get(operacao)
+    if entrada is None:
+        return _responder_json(start_response, '404 Not Found',
+                               {"erro": f"Operação desconhecida: {operacao}"})
+    
+    funcao, parametros = entrada
+    query = dict(parse_qsl(environ.get('QUERY_STRING', '')))
+    faltando = [p for p in parametros if p not in query]
+    if faltando:
+        return _responder_json(start_response, '400 Bad Request',
+                               {"erro": f"Parâmetros obrigatórios ausentes: {', '.join(faltando)}"})
+    
+    resultado = funcao(*(query[p] for p in parametros))
+    if resultado is None:
+        return _responder_json(start_response, '404 Not Found', {"erro": "Recurso não encontrado"})
+    return _responder_json(start_response, '200 OK', resultado)
+
+def manipular_cors_e_roteamento(environ, start_response):
+    """Manipula CORS e roteamento de requisições."""
+    method = environ['REQUEST_METHOD']
+    path = environ.get('PATH_INFO', '/')
+    
+    # Log request details (formatado apenas com DEBUG habilitado)
+    logger.debug("SOAP Request: %s %s", method, path)
+    logger.debug("Headers: %s", environ)
+    
+    # Normalizar path para SOAP
+    if path.startswith(_PREFIXO_SOAP):
+        environ['PATH_INFO'] = path[_TAMANHO_PREFIXO_SOAP:] or '/'
+    
+    # Preflight CORS
+    if method == 'OPTIONS':
+        start_response('200 OK', list(_CORS_HEADERS))
+        return [b'OK']
+    
+    # Fast-path JSON
+    if environ['PATH_INFO'].startswith(_PREFIXO_FAST):
+        return manipular_fast(environ, start_response)
+    
+    if method == 'GET':
+        # Página informativa
+        if not _WSDL_QUERY_RE.search(environ.get('QUERY_STRING', '')):
+            start_response('200 OK', [('Content-Type', 'text/html')])
+            return [_INFO_HTML_BYTES]
+        # WSDL pré-gerado
+        start_response('200 OK', [
+            ('Content-Type', 'text/xml; charset=utf-8'),
+            ('Content-Length', str(len(_WSDL_BYTES))),
+            *_CORS_HEADERS,
+        ])
+        return [_WSDL_BYTES]
 
     def start_response_com_cors(status, headers):
         """Adiciona headers CORS à resposta."""
-        headers.extend([
-            ('Access-Control-Allow-Origin', '*'),
-            ('Access-Control-Allow-Methods', 'GET, POST, OPTIONS'),
-            ('Access-Control-Allow-Headers', 'Content-Type, SOAPAction')
-        ])
+        headers.extend(_CORS_HEADERS)
         return start_response(status, headers)
 
-    try:
-        # Process SOAP request
-        application = criar_aplicacao_soap()
-        wsgi_app = WsgiApplication(application)
-        return wsgi_app(environ, start_response_com_cors)
-    except Exception as e:
-        print(f"SOAP Error: {str(e)}")
-        error_response = f"""
-        <soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
-            <soap:Body>
-                <soap:Fault>
-                    <faultcode>soap:Server</faultcode>
-                    <faultstring>Internal Server Error</faultstring>
-                    <detail>
-                        <error>{str(e)}</error>
-                        <traceback>{traceback.format_exc()}</traceback>
-                    </detail>
-                </soap:Fault>
-            </soap:Body>
-        </soap:Envelope>
-        """
-        start_response_com_cors('500 Internal Server Error', [('Content-Type', 'text/xml')])
-        return [error_response.encode('utf-8')]
+    # Erros das operações viram soap:Fault pelo próprio Spyne
+    return _WSGI_APP(environ, start_response_com_cors)
+
+def executar_servidor(host="0.0.0.0", port=8004, dev=False, threads=8):
+    """Executa o servidor SOAP.
 
-def executar_servidor(host="0.0.0.0", port=8004):
-    """Executa o servidor SOAP."""
+    Usa waitress (multi-thread) quando disponível; o wsgiref fica restrito
+    ao modo de desenvolvimento (``dev=True``) ou à ausência do waitress.
+    """
     print(f"Iniciando servidor SOAP em http://{host}:{port}")
     print("Pressione Ctrl+C para encerrar")
     
-    application = criar_aplicacao_soap()
-    wsgi_app = WsgiApplication(application)
-    server = make_server(host, port, manipular_cors_e_roteamento)
-    server.serve_forever()
+    if dev or not WAITRESS_AVAILABLE:
+        if not dev:
+            print("⚠️ waitress não encontrado - usando wsgiref (uma requisição por vez)")
+        server = make_server(host, port, manipular_cors_e_roteamento)
+        server.serve_forever()
+    else:
+        serve(manipular_cors_e_roteamento, host=host, port=port, threads=threads)
 
 if __name__ == '__main__':
-    executar_servidor()
+    executar_servidor(dev='--dev' in sys.argv)
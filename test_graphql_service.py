@@ -3,28 +3,87 @@ Test suite for GraphQL service - Expanded CRUD Tests
 """
 
 import requests
+from http_pool import SESSION as _SESSION
 import json
-import time
 import pytest
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    try:  # ujson: C encoder for platforms without orjson wheels
+        import ujson
+        def _dumps(obj):
+            return ujson.dumps(obj).encode("utf-8")
+        _loads = ujson.loads
+    except ImportError:  # stdlib fallback
+        def _dumps(obj):
+            return json.dumps(obj).encode("utf-8")
+        _loads = json.loads
+
 # Base URL for the GraphQL service
 BASE_URL = "http://localhost:8001/graphql"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Minified GraphQL documents, built once at import time
+Q_CREATE_USER = "mutation($input:UsuarioInput!){criar_usuario(input:$input){id nome idade}}"
+Q_CREATE_MUSIC = "mutation($input:MusicaInput!){criar_musica(input:$input){id nome artista duracao_segundos}}"
+Q_CREATE_PLAYLIST = "mutation($input:PlaylistInput!){criar_playlist(input:$input){id nome id_usuario musicas}}"
+# Id-only variants for setup helpers that just need the new entity's id
+Q_CREATE_USER_ID = "mutation($input:UsuarioInput!){criar_usuario(input:$input){id}}"
+Q_CREATE_MUSIC_ID = "mutation($input:MusicaInput!){criar_musica(input:$input){id}}"
+Q_CREATE_PLAYLIST_ID = "mutation($input:PlaylistInput!){criar_playlist(input:$input){id}}"
+Q_READY = "query{__schema{queryType{name}}}"
+Q_GET_USER = "query($id:String!){usuario(id:$id){id nome idade}}"
+Q_UPDATE_USER = "mutation($id:String!,$input:UsuarioInput!){atualizar_usuario(id:$id,input:$input){id nome idade}}"
+Q_DELETE_USER = "mutation($id:String!){deletar_usuario(id:$id)}"
+Q_UPDATE_MUSIC = "mutation($id:String!,$input:MusicaInput!){atualizar_musica(id:$id,input:$input){id nome artista duracao_segundos}}"
+Q_DELETE_MUSIC = "mutation($id:String!){deletar_musica(id:$id)}"
+Q_USER_PLAYLISTS = "query($userId:String!){playlists_usuario(id_usuario:$userId){id nome id_usuario musicas}}"
+Q_PLAYLIST_SONGS = "query($playlistId:String!){musicas_playlist(id_playlist:$playlistId){id nome artista duracao_segundos}}"
+Q_UPDATE_PLAYLIST = "mutation($id:String!,$input:PlaylistInput!){atualizar_playlist(id:$id,input:$input){id nome id_usuario musicas}}"
+Q_DELETE_PLAYLIST = "mutation($id:String!){deletar_playlist(id:$id)}"
+Q_PLAYLIST_COMPLETE = "query($playlistId:String!){playlist_completa(id_playlist:$playlistId){id nome usuario{id nome idade}musicas{id nome artista duracao_segundos}}}"
+Q_PLAYLISTS_WITH_MUSIC = "query($musicId:String!){playlists_com_musica(id_musica:$musicId){id nome id_usuario musicas}}"
+# Independent read-only roots fetched together in one request
+Q_SNAPSHOT = (
+    "query{estatisticas{total_usuarios total_musicas total_playlists"
+    " usuarios_com_playlists media_musicas_por_playlist tecnologia}"
+    " usuarios{id nome idade} musicas{id nome artista duracao_segundos}}"
+)
+Q_NONEXISTENT_USER = 'query{usuario(id:"nonexistent-user-id"){id nome idade}}'
+Q_NONEXISTENT_PLAYLIST_SONGS = 'query{musicas_playlist(id_playlist:"nonexistent-playlist-id"){id nome artista duracao_segundos}}'
+
+# Aliased user + N musics creation documents, keyed by N
+_USER_AND_MUSICS_DOCS = {}
+
+# Pre-serialized POST bodies for queries sent without variables
+_PAYLOAD_CACHE = {}
+
+@pytest.fixture(scope="module", autouse=True)
+def _wait_for_service(wait_for_http):
+    """Wait until the GraphQL endpoint answers before running the module"""
+    body = _PAYLOAD_CACHE[Q_READY] = _dumps({"query": Q_READY})
+    wait_for_http(BASE_URL, data=body, headers=JSON_HEADERS)
 
 # ===== HELPER FUNCTIONS =====
 
 def make_graphql_request(query, variables=None):
     """Make a GraphQL request and return the response"""
-    payload = {"query": query}
     if variables:
-        payload["variables"] = variables
-    
-    response = requests.post(BASE_URL, json=payload, timeout=10)
-    return response
+        body = _dumps({"query": query, "variables": variables})
+    else:
+        # Parameterless queries always send the same body: serialize once
+        body = _PAYLOAD_CACHE.get(query)
+        if body is None:
+            body = _PAYLOAD_CACHE[query] = _dumps({"query": query})
+    return _SESSION.post(BASE_URL, data=body, headers=JSON_HEADERS, timeout=10)
 
 def assert_graphql_response(response, expected_data_key=None, allow_null=False):
     """Assert basic GraphQL response structure"""
     assert response.status_code == 200
-    data = response.json()
+    data = _loads(response.content)
     assert "data" in data
     if expected_data_key:
         assert expected_data_key in data["data"]
@@ -34,15 +93,7 @@ def assert_graphql_response(response, expected_data_key=None, allow_null=False):
 
 def create_test_user():
     """Helper function to create a test user and return its ID"""
-    response = make_graphql_request("""
-        mutation($input: UsuarioInput!) {
-            criar_usuario(input: $input) {
-                id
-                nome
-                idade
-            }
-        }
-    """, {
+    response = make_graphql_request(Q_CREATE_USER_ID, {
         "input": {
             "nome": "Test User GraphQL",
             "idade": 28
@@ -54,16 +105,7 @@ def create_test_user():
 
 def create_test_music():
     """Helper function to create a test music and return its ID"""
-    response = make_graphql_request("""
-        mutation($input: MusicaInput!) {
-            criar_musica(input: $input) {
-                id
-                nome
-                artista
-                duracao_segundos
-            }
-        }
-    """, {
+    response = make_graphql_request(Q_CREATE_MUSIC_ID, {
         "input": {
             "nome": "Test Song GraphQL",
             "artista": "Test Artist",
@@ -74,45 +116,81 @@ def create_test_music():
     created_music = data["data"]["criar_musica"]
     return created_music["id"]
 
-def create_test_playlist():
-    """Helper function to create a test playlist and return its ID"""
-    user_id = create_test_user()
-    music_id = create_test_music()
-    
-    response = make_graphql_request("""
-        mutation($input: PlaylistInput!) {
-            criar_playlist(input: $input) {
-                id
-                nome
-                id_usuario
-                musicas
-            }
+def create_test_user_and_musics(n_musics=1):
+    """Create a test user and ``n_musics`` test musics in one aliased mutation.
+
+    The server does not accept JSON-array batches, so the independent
+    creations are sent as aliased fields of a single document.
+    Returns ``(user_id, [music_id, ...])``.
+    """
+    query = _USER_AND_MUSICS_DOCS.get(n_musics)
+    if query is None:
+        var_defs = ["$u:UsuarioInput!"] + [f"$m{i}:MusicaInput!" for i in range(n_musics)]
+        fields = ["u:criar_usuario(input:$u){id}"] + [
+            f"m{i}:criar_musica(input:$m{i}){{id}}" for i in range(n_musics)
+        ]
+        query = _USER_AND_MUSICS_DOCS[n_musics] = (
+            f"mutation({','.join(var_defs)}){{{' '.join(fields)}}}"
+        )
+    variables = {"u": {"nome": "Test User GraphQL", "idade": 28}}
+    for i in range(n_musics):
+        variables[f"m{i}"] = {
+            "nome": "Test Song GraphQL",
+            "artista": "Test Artist",
+            "duracao_segundos": 240
         }
-    """, {
+    response = make_graphql_request(query, variables)
+    data = assert_graphql_response(response, "u")["data"]
+    return data["u"]["id"], [data[f"m{i}"]["id"] for i in range(n_musics)]
+
+def _make_playlist(user_id, music_ids, nome="Test Playlist GraphQL"):
+    """Create a playlist for existing user/musics and return its ID"""
+    response = make_graphql_request(Q_CREATE_PLAYLIST_ID, {
         "input": {
-            "nome": "Test Playlist GraphQL",
+            "nome": nome,
             "id_usuario": user_id,
-            "musicas": [music_id]
+            "musicas": music_ids
         }
     })
     data = assert_graphql_response(response, "criar_playlist")
-    created_playlist = data["data"]["criar_playlist"]
-    return created_playlist["id"]
+    return data["data"]["criar_playlist"]["id"]
+
+def create_test_playlist():
+    """Helper function to create a test playlist and return its ID"""
+    user_id, music_ids = create_test_user_and_musics(1)
+    return _make_playlist(user_id, music_ids)
+
+# ===== SHARED FIXTURES =====
+# Read-only tests share entities created once per module; tests that
+# mutate or delete still create their own.
+
+@pytest.fixture(scope="module")
+def seed_user_id():
+    """User created once and never modified by the tests"""
+    return create_test_user()
+
+@pytest.fixture(scope="module")
+def seed_music_id():
+    """Music created once and never modified by the tests"""
+    return create_test_music()
+
+@pytest.fixture(scope="module")
+def seed_playlist_id(seed_user_id, seed_music_id):
+    """Playlist owned by the seed user containing only the seed music"""
+    return _make_playlist(seed_user_id, [seed_music_id], "Seed Playlist GraphQL")
+
+@pytest.fixture(scope="module")
+def snapshot():
+    """Stats, users and songs fetched once in a single multi-root query"""
+    response = make_graphql_request(Q_SNAPSHOT)
+    return assert_graphql_response(response, "estatisticas")["data"]
 
 # ===== BASIC CONNECTIVITY TESTS =====
 
 def test_service_is_running():
     """Test if the GraphQL service is accessible"""
     try:
-        response = make_graphql_request("""
-            query {
-                __schema {
-                    types {
-                        name
-                    }
-                }
-            }
-        """)
+        response = make_graphql_request(Q_READY)
         data = assert_graphql_response(response)
         assert "__schema" in data["data"]
         print("✅ GraphQL service is running and accessible")
@@ -121,35 +199,17 @@ def test_service_is_running():
 
 # ===== USER TESTS =====
 
-def test_list_users():
+def test_list_users(snapshot):
     """Test listing all users"""
-    response = make_graphql_request("""
-        query {
-            usuarios {
-                id
-                nome
-                idade
-            }
-        }
-    """)
-    data = assert_graphql_response(response, "usuarios")
-    users = data["data"]["usuarios"]
+    users = snapshot["usuarios"]
     assert isinstance(users, list)
-    assert len(users) > 0
-    assert all("id" in u and "nome" in u and "idade" in u for u in users)
+    # The schema guarantees the same fields on every row: check the first only
+    assert users and users[0].keys() >= {"id", "nome", "idade"}
     print(f"✅ Listed {len(users)} users")
 
 def test_create_user():
     """Test creating a new user"""
-    response = make_graphql_request("""
-        mutation($input: UsuarioInput!) {
-            criar_usuario(input: $input) {
-                id
-                nome
-                idade
-            }
-        }
-    """, {
+    response = make_graphql_request(Q_CREATE_USER, {
         "input": {
             "nome": "Test User GraphQL",
             "idade": 28
@@ -162,21 +222,10 @@ def test_create_user():
     assert "id" in created_user
     print(f"✅ Created user: {created_user['id']}")
 
-def test_get_user():
+def test_get_user(seed_user_id):
     """Test getting a single user by ID"""
-    # First create a user
-    user_id = create_test_user()
-    
-    # Then get it
-    response = make_graphql_request("""
-        query($id: String!) {
-            usuario(id: $id) {
-                id
-                nome
-                idade
-            }
-        }
-    """, {"id": user_id})
+    user_id = seed_user_id
+    response = make_graphql_request(Q_GET_USER, {"id": user_id})
     data = assert_graphql_response(response, "usuario")
     user = data["data"]["usuario"]
     assert user["id"] == user_id
@@ -190,15 +239,7 @@ def test_update_user():
     user_id = create_test_user()
     
     # Then update it
-    response = make_graphql_request("""
-        mutation($id: String!, $input: UsuarioInput!) {
-            atualizar_usuario(id: $id, input: $input) {
-                id
-                nome
-                idade
-            }
-        }
-    """, {
+    response = make_graphql_request(Q_UPDATE_USER, {
         "id": user_id,
         "input": {
             "nome": "Updated Test User",
@@ -218,48 +259,23 @@ def test_delete_user():
     user_id = create_test_user()
     
     # Then delete it
-    response = make_graphql_request("""
-        mutation($id: String!) {
-            deletar_usuario(id: $id)
-        }
-    """, {"id": user_id})
+    response = make_graphql_request(Q_DELETE_USER, {"id": user_id})
     data = assert_graphql_response(response, "deletar_usuario")
     assert data["data"]["deletar_usuario"] == True
     print(f"✅ Deleted user: {user_id}")
 
 # ===== MUSIC TESTS =====
 
-def test_list_songs():
+def test_list_songs(snapshot):
     """Test listing all songs"""
-    response = make_graphql_request("""
-        query {
-            musicas {
-                id
-                nome
-                artista
-                duracao_segundos
-            }
-        }
-    """)
-    data = assert_graphql_response(response, "musicas")
-    songs = data["data"]["musicas"]
+    songs = snapshot["musicas"]
     assert isinstance(songs, list)
-    assert len(songs) > 0
-    assert all("id" in s and "nome" in s and "artista" in s and "duracao_segundos" in s for s in songs)
+    assert songs and songs[0].keys() >= {"id", "nome", "artista", "duracao_segundos"}
     print(f"✅ Listed {len(songs)} songs")
 
 def test_create_music():
     """Test creating a new music"""
-    response = make_graphql_request("""
-        mutation($input: MusicaInput!) {
-            criar_musica(input: $input) {
-                id
-                nome
-                artista
-                duracao_segundos
-            }
-        }
-    """, {
+    response = make_graphql_request(Q_CREATE_MUSIC, {
         "input": {
             "nome": "Test Song GraphQL",
             "artista": "Test Artist",
@@ -280,16 +296,7 @@ def test_update_music():
     music_id = create_test_music()
     
     # Then update it
-    response = make_graphql_request("""
-        mutation($id: String!, $input: MusicaInput!) {
-            atualizar_musica(id: $id, input: $input) {
-                id
-                nome
-                artista
-                duracao_segundos
-            }
-        }
-    """, {
+    response = make_graphql_request(Q_UPDATE_MUSIC, {
         "id": music_id,
         "input": {
             "nome": "Updated Test Song",
@@ -311,64 +318,29 @@ def test_delete_music():
     music_id = create_test_music()
     
     # Then delete it
-    response = make_graphql_request("""
-        mutation($id: String!) {
-            deletar_musica(id: $id)
-        }
-    """, {"id": music_id})
+    response = make_graphql_request(Q_DELETE_MUSIC, {"id": music_id})
     data = assert_graphql_response(response, "deletar_musica")
     assert data["data"]["deletar_musica"] == True
     print(f"✅ Deleted music: {music_id}")
 
 # ===== PLAYLIST TESTS =====
 
-def test_list_playlists():
+def test_list_playlists(seed_user_id, seed_playlist_id):
     """Test listing playlists for a user"""
-    # First, get a user ID
-    response = make_graphql_request("""
-        query {
-            usuarios {
-                id
-            }
-        }
-    """)
-    data = assert_graphql_response(response, "usuarios")
-    users = data["data"]["usuarios"]
-    assert len(users) > 0
-    user_id = users[0]["id"]
-
-    # Now test playlists for this user
-    response = make_graphql_request("""
-        query($userId: String!) {
-            playlists_usuario(id_usuario: $userId) {
-                id
-                nome
-                id_usuario
-                musicas
-            }
-        }
-    """, {"userId": user_id})
+    user_id = seed_user_id
+    response = make_graphql_request(Q_USER_PLAYLISTS, {"userId": user_id})
     data = assert_graphql_response(response, "playlists_usuario")
     playlists = data["data"]["playlists_usuario"]
     assert isinstance(playlists, list)
+    assert seed_playlist_id in [p["id"] for p in playlists]
     print(f"✅ Listed {len(playlists)} playlists for user {user_id}")
 
 def test_create_playlist():
     """Test creating a new playlist"""
     # First create a user and get some music IDs
-    user_id = create_test_user()
-    music_id = create_test_music()
+    user_id, (music_id,) = create_test_user_and_musics(1)
     
-    response = make_graphql_request("""
-        mutation($input: PlaylistInput!) {
-            criar_playlist(input: $input) {
-                id
-                nome
-                id_usuario
-                musicas
-            }
-        }
-    """, {
+    response = make_graphql_request(Q_CREATE_PLAYLIST, {
         "input": {
             "nome": "Test Playlist GraphQL",
             "id_usuario": user_id,
@@ -386,41 +358,15 @@ def test_create_playlist():
 def test_create_and_get_playlist():
     """Test creating a playlist and retrieving its songs"""
     # Create dependencies
-    user_id = create_test_user()
-    music_id1 = create_test_music()
-    music_id2 = create_test_music()
+    user_id, (music_id1, music_id2) = create_test_user_and_musics(2)
     
     # Create playlist
-    response = make_graphql_request("""
-        mutation($input: PlaylistInput!) {
-            criar_playlist(input: $input) {
-                id
-                nome
-                id_usuario
-                musicas
-            }
-        }
-    """, {
-        "input": {
-            "nome": "Test Multi-Song Playlist",
-            "id_usuario": user_id,
-            "musicas": [music_id1, music_id2]
-        }
-    })
-    data = assert_graphql_response(response, "criar_playlist")
-    playlist_id = data["data"]["criar_playlist"]["id"]
+    playlist_id = _make_playlist(
+        user_id, [music_id1, music_id2], "Test Multi-Song Playlist"
+    )
     
     # Get playlist songs
-    response = make_graphql_request("""
-        query($playlistId: String!) {
-            musicas_playlist(id_playlist: $playlistId) {
-                id
-                nome
-                artista
-                duracao_segundos
-            }
-        }
-    """, {"playlistId": playlist_id})
+    response = make_graphql_request(Q_PLAYLIST_SONGS, {"playlistId": playlist_id})
     data = assert_graphql_response(response, "musicas_playlist")
     songs = data["data"]["musicas_playlist"]
     assert len(songs) == 2
@@ -432,22 +378,11 @@ def test_create_and_get_playlist():
 def test_update_playlist():
     """Test updating a playlist"""
     # Create dependencies
-    user_id = create_test_user()
-    music_id1 = create_test_music()
-    music_id2 = create_test_music()
-    playlist_id = create_test_playlist()
+    user_id, (music_id1, music_id2) = create_test_user_and_musics(2)
+    playlist_id = _make_playlist(user_id, [music_id1])
     
     # Update playlist
-    response = make_graphql_request("""
-        mutation($id: String!, $input: PlaylistInput!) {
-            atualizar_playlist(id: $id, input: $input) {
-                id
-                nome
-                id_usuario
-                musicas
-            }
-        }
-    """, {
+    response = make_graphql_request(Q_UPDATE_PLAYLIST, {
         "id": playlist_id,
         "input": {
             "nome": "Updated Test Playlist",
@@ -468,128 +403,43 @@ def test_delete_playlist():
     playlist_id = create_test_playlist()
     
     # Then delete it
-    response = make_graphql_request("""
-        mutation($id: String!) {
-            deletar_playlist(id: $id)
-        }
-    """, {"id": playlist_id})
+    response = make_graphql_request(Q_DELETE_PLAYLIST, {"id": playlist_id})
     data = assert_graphql_response(response, "deletar_playlist")
     assert data["data"]["deletar_playlist"] == True
     print(f"✅ Deleted playlist: {playlist_id}")
 
 # ===== ADVANCED QUERY TESTS =====
 
-def test_playlist_complete():
+def test_playlist_complete(seed_user_id, seed_music_id, seed_playlist_id):
     """Test getting complete playlist data"""
-    # Create dependencies
-    user_id = create_test_user()
-    music_id = create_test_music()
-    
-    # Create playlist
-    response = make_graphql_request("""
-        mutation($input: PlaylistInput!) {
-            criar_playlist(input: $input) {
-                id
-            }
-        }
-    """, {
-        "input": {
-            "nome": "Complete Test Playlist",
-            "id_usuario": user_id,
-            "musicas": [music_id]
-        }
-    })
-    data = assert_graphql_response(response, "criar_playlist")
-    playlist_id = data["data"]["criar_playlist"]["id"]
-    
-    # Get complete playlist
-    response = make_graphql_request("""
-        query($playlistId: String!) {
-            playlist_completa(id_playlist: $playlistId) {
-                id
-                nome
-                usuario {
-                    id
-                    nome
-                    idade
-                }
-                musicas {
-                    id
-                    nome
-                    artista
-                    duracao_segundos
-                }
-            }
-        }
-    """, {"playlistId": playlist_id})
+    playlist_id = seed_playlist_id
+    response = make_graphql_request(Q_PLAYLIST_COMPLETE, {"playlistId": playlist_id})
     data = assert_graphql_response(response, "playlist_completa")
     complete_playlist = data["data"]["playlist_completa"]
     assert complete_playlist["id"] == playlist_id
-    assert complete_playlist["nome"] == "Complete Test Playlist"
-    assert complete_playlist["usuario"]["id"] == user_id
+    assert complete_playlist["nome"] == "Seed Playlist GraphQL"
+    assert complete_playlist["usuario"]["id"] == seed_user_id
     assert len(complete_playlist["musicas"]) == 1
-    assert complete_playlist["musicas"][0]["id"] == music_id
+    assert complete_playlist["musicas"][0]["id"] == seed_music_id
     print(f"✅ Retrieved complete playlist data: {playlist_id}")
 
-def test_playlists_with_music():
+def test_playlists_with_music(seed_music_id, seed_playlist_id):
     """Test finding playlists that contain a specific music"""
-    # Create dependencies
-    user_id = create_test_user()
-    music_id = create_test_music()
-    
-    # Create playlist with the music
-    response = make_graphql_request("""
-        mutation($input: PlaylistInput!) {
-            criar_playlist(input: $input) {
-                id
-            }
-        }
-    """, {
-        "input": {
-            "nome": "Playlist With Specific Music",
-            "id_usuario": user_id,
-            "musicas": [music_id]
-        }
-    })
-    playlist_id = response.json()["data"]["criar_playlist"]["id"]
-    
-    # Find playlists with this music
-    response = make_graphql_request("""
-        query($musicId: String!) {
-            playlists_com_musica(id_musica: $musicId) {
-                id
-                nome
-                id_usuario
-                musicas
-            }
-        }
-    """, {"musicId": music_id})
+    music_id = seed_music_id
+    response = make_graphql_request(Q_PLAYLISTS_WITH_MUSIC, {"musicId": music_id})
     data = assert_graphql_response(response, "playlists_com_musica")
     playlists = data["data"]["playlists_com_musica"]
     assert len(playlists) >= 1
-    found_playlist = next((p for p in playlists if p["id"] == playlist_id), None)
+    found_playlist = next((p for p in playlists if p["id"] == seed_playlist_id), None)
     assert found_playlist is not None
     assert music_id in found_playlist["musicas"]
     print(f"✅ Found {len(playlists)} playlists containing music: {music_id}")
 
 # ===== STATISTICS TESTS =====
 
-def test_service_stats():
+def test_service_stats(snapshot):
     """Test getting service statistics"""
-    response = make_graphql_request("""
-        query {
-            estatisticas {
-                total_usuarios
-                total_musicas
-                total_playlists
-                usuarios_com_playlists
-                media_musicas_por_playlist
-                tecnologia
-            }
-        }
-    """)
-    data = assert_graphql_response(response, "estatisticas")
-    stats = data["data"]["estatisticas"]
+    stats = snapshot["estatisticas"]
     assert isinstance(stats["total_usuarios"], int)
     assert isinstance(stats["total_musicas"], int)
     assert isinstance(stats["total_playlists"], int)
@@ -606,93 +456,51 @@ def test_service_stats():
 def test_user_validation_errors():
     """Test user validation errors"""
     # Test empty name
-    response = make_graphql_request("""
-        mutation($input: UsuarioInput!) {
-            criar_usuario(input: $input) {
-                id
-                nome
-                idade
-            }
-        }
-    """, {
+    response = make_graphql_request(Q_CREATE_USER, {
         "input": {
             "nome": "",
             "idade": 25
         }
     })
-    data = response.json()
+    data = _loads(response.content)
     assert "errors" in data
     print("✅ Empty name validation working")
     
     # Test invalid age
-    response = make_graphql_request("""
-        mutation($input: UsuarioInput!) {
-            criar_usuario(input: $input) {
-                id
-                nome
-                idade
-            }
-        }
-    """, {
+    response = make_graphql_request(Q_CREATE_USER, {
         "input": {
             "nome": "Valid Name",
             "idade": -5
         }
     })
-    data = response.json()
+    data = _loads(response.content)
     assert "errors" in data
     print("✅ Invalid age validation working")
 
 def test_music_validation_errors():
     """Test music validation errors"""
     # Test invalid duration
-    response = make_graphql_request("""
-        mutation($input: MusicaInput!) {
-            criar_musica(input: $input) {
-                id
-                nome
-                artista
-                duracao_segundos
-            }
-        }
-    """, {
+    response = make_graphql_request(Q_CREATE_MUSIC, {
         "input": {
             "nome": "Test Song",
             "artista": "Test Artist",
             "duracao_segundos": -10
         }
     })
-    data = response.json()
+    data = _loads(response.content)
     assert "errors" in data
     print("✅ Invalid duration validation working")
 
 def test_nonexistent_resource_errors():
     """Test errors when accessing non-existent resources"""
     # Test non-existent user
-    response = make_graphql_request("""
-        query {
-            usuario(id: "nonexistent-user-id") {
-                id
-                nome
-                idade
-            }
-        }
-    """)
+    response = make_graphql_request(Q_NONEXISTENT_USER)
     data = assert_graphql_response(response, "usuario", allow_null=True)
     assert data["data"]["usuario"] is None
     print("✅ Non-existent user handling working")
     
     # Test non-existent playlist
-    response = make_graphql_request("""
-        query {
-            musicas_playlist(id_playlist: "nonexistent-playlist-id") {
-                id
-                nome
-                artista
-                duracao_segundos
-            }
-        }
-    """)
+    response = make_graphql_request(Q_NONEXISTENT_PLAYLIST_SONGS)
     data = assert_graphql_response(response, "musicas_playlist")
     assert data["data"]["musicas_playlist"] == []
     print("✅ Non-existent playlist handling working")
@@ -700,6 +508,4 @@ def test_nonexistent_resource_errors():
 if __name__ == "__main__":
     print("Starting GraphQL service tests...")
     print("Make sure the GraphQL service is running on http://localhost:8001")
-    print("Running tests in 5 seconds...")
-    time.sleep(5)
     pytest.main([__file__]) 
\ No newline at end of file
@@ -1,6 +1,6 @@
 import pytest
 import grpc
-import time
+from itertools import islice
 from streaming_pb2 import (
     Empty,
     UsuarioRequest,
@@ -21,13 +21,64 @@ from streaming_pb2 import (
     AtualizarPlaylistRequest,
     BooleanResponse
 )
-from streaming_pb2_grpc import StreamingServiceStub
 
 # ========== HELPER FUNCTIONS ==========
 
-def create_channel():
-    """Create a gRPC channel to the service."""
-    return grpc.insecure_channel('localhost:50051')
+# Static requests built once and reused; messages are not mutated after sending
+EMPTY = Empty()
+NONEXISTENT_USER_REQ = UsuarioRequest(id_usuario="nonexistent_id")
+NONEXISTENT_SONG_REQ = MusicaRequest(id_musica="nonexistent_id")
+NONEXISTENT_PLAYLIST_REQ = PlaylistRequest(id_playlist="nonexistent_id")
+
+# Full-table listings fetched once and shared by the listing tests and
+# by the fixtures that only need a few existing ids
+
+@pytest.fixture(scope="module")
+def users_response(grpc_stub):
+    """ListarTodosUsuarios response, fetched once per module"""
+    return grpc_stub.ListarTodosUsuarios(EMPTY)
+
+@pytest.fixture(scope="module")
+def songs_response(grpc_stub):
+    """ListarTodasMusicas response, fetched once per module"""
+    return grpc_stub.ListarTodasMusicas(EMPTY)
+
+@pytest.fixture(scope="module")
+def any_user_id(users_response):
+    """ID of an existing user"""
+    return users_response.usuarios[0].id
+
+@pytest.fixture(scope="module")
+def some_song_ids(songs_response):
+    """IDs of the first three existing songs"""
+    return [song.id for song in islice(songs_response.musicas, 3)]
+
+# Entities created once and only read by the tests; tests that mutate or
+# delete still create their own. seed_user also owns the playlists those
+# tests create.
+
+@pytest.fixture(scope="module")
+def seed_user(grpc_stub):
+    """User created once per module and never modified"""
+    return grpc_stub.CriarUsuario(CriarUsuarioRequest(nome="Seed User gRPC", idade=28))
+
+@pytest.fixture(scope="module")
+def seed_song(grpc_stub):
+    """Song created once per module and never modified"""
+    return grpc_stub.CriarMusica(CriarMusicaRequest(
+        nome="Seed Song gRPC",
+        artista="Seed Artist",
+        duracao_segundos=150
+    ))
+
+@pytest.fixture(scope="module")
+def seed_playlist(grpc_stub, seed_user, some_song_ids):
+    """Playlist of the seed user with two existing songs, never modified"""
+    return grpc_stub.CriarPlaylist(CriarPlaylistRequest(
+        nome="Seed Playlist gRPC",
+        id_usuario=seed_user.id,
+        musicas=some_song_ids[:2]
+    ))
 
 def create_test_user(stub, nome="Test User gRPC", idade=25):
     """Helper function to create a test user"""
@@ -49,13 +100,8 @@ def create_test_song(stub, nome="Test Song", artista="Test Artist", duracao=180)
     except grpc.RpcError:
         return None
 
-def create_test_playlist(stub, nome="Test Playlist", user_id=None, musicas=None):
+def create_test_playlist(stub, user_id, nome="Test Playlist", musicas=None):
     """Helper function to create a test playlist"""
-    if user_id is None:
-        # Create a user first
-        user = create_test_user(stub)
-        user_id = user.id
-    
     if musicas is None:
         musicas = []
     
@@ -71,541 +117,401 @@ def create_test_playlist(stub, nome="Test Playlist", user_id=None, musicas=None)
 
 # ========== BASIC SERVICE TESTS ==========
 
-def test_service_is_running():
+def test_service_is_running(grpc_stub):
     """Test if the gRPC service is running and accessible"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        response = stub.ObterEstatisticas(Empty())
-        assert isinstance(response, EstatisticasResponse)
-        assert hasattr(response, 'total_usuarios')
-        assert hasattr(response, 'total_musicas')
-        assert hasattr(response, 'total_playlists')
-        assert hasattr(response, 'media_musicas_por_playlist')
-        assert hasattr(response, 'tecnologia')
-
-def test_service_stats():
+    response = grpc_stub.ObterEstatisticas(EMPTY)
+    assert isinstance(response, EstatisticasResponse)
+
+def test_service_stats(grpc_stub):
     """Test the stats endpoint"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        response = stub.ObterEstatisticas(Empty())
-        assert isinstance(response, EstatisticasResponse)
-        assert isinstance(response.total_usuarios, int)
-        assert isinstance(response.total_musicas, int)
-        assert isinstance(response.total_playlists, int)
-        assert isinstance(response.media_musicas_por_playlist, float)
-        assert isinstance(response.tecnologia, str)
-        assert response.tecnologia == "gRPC"
+    response = grpc_stub.ObterEstatisticas(EMPTY)
+    assert isinstance(response, EstatisticasResponse)
+    assert isinstance(response.total_usuarios, int)
+    assert isinstance(response.total_musicas, int)
+    assert isinstance(response.total_playlists, int)
+    assert isinstance(response.media_musicas_por_playlist, float)
+    assert isinstance(response.tecnologia, str)
+    assert response.tecnologia == "gRPC"
 
 # ========== USUARIOS CRUD TESTS ==========
 
-def test_list_users():
+def test_list_users(users_response):
     """Test listing users"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        response = stub.ListarTodosUsuarios(Empty())
-        assert isinstance(response, UsuariosResponse)
-        assert hasattr(response, 'usuarios')
-        assert len(response.usuarios) > 0  # Verifica se tem usuários
-        for user in response.usuarios:
-            assert isinstance(user, Usuario)
-            assert hasattr(user, 'id')
-            assert hasattr(user, 'nome')
-            assert hasattr(user, 'idade')
-
-def test_create_user():
+    response = users_response
+    assert isinstance(response, UsuariosResponse)
+    assert len(response.usuarios) > 0  # Verifica se tem usuários
+    assert all(isinstance(user, Usuario) for user in response.usuarios)
+
+def test_create_user(grpc_stub):
     """Test creating a new user"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        created_user = stub.CriarUsuario(CriarUsuarioRequest(nome="Test User Create", idade=25))
-        assert created_user.nome == "Test User Create"
-        assert created_user.idade == 25
-        assert created_user.id  # Verifica se tem ID
-
-def test_get_user():
+    created_user = grpc_stub.CriarUsuario(CriarUsuarioRequest(nome="Test User Create", idade=25))
+    assert created_user.nome == "Test User Create"
+    assert created_user.idade == 25
+    assert created_user.id  # Verifica se tem ID
+
+def test_get_user(grpc_stub, seed_user):
     """Test getting a specific user"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Create a user first
-        created_user = create_test_user(stub, "Get User Test", 28)
-        assert created_user is not None
-        
-        # Get the created user
-        retrieved_user = stub.ObterUsuario(UsuarioRequest(id_usuario=created_user.id))
-        assert retrieved_user.id == created_user.id
-        assert retrieved_user.nome == "Get User Test"
-        assert retrieved_user.idade == 28
-
-def test_update_user():
-    """Test updating an existing user"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Create a user first
-        created_user = create_test_user(stub, "Update User Test", 30)
-        assert created_user is not None
-        
-        # Update the user
-        updated_user = stub.AtualizarUsuario(AtualizarUsuarioRequest(
-            id_usuario=created_user.id,
-            nome="Updated User Name",
-            idade=35
-        ))
-        assert updated_user.id == created_user.id
-        assert updated_user.nome == "Updated User Name"
-        assert updated_user.idade == 35
+    retrieved_user = grpc_stub.ObterUsuario(UsuarioRequest(id_usuario=seed_user.id))
+    assert retrieved_user.id == seed_user.id
+    assert retrieved_user.nome == "Seed User gRPC"
+    assert retrieved_user.idade == 28
 
-def test_delete_user():
+def test_update_user(grpc_stub):
+    """Test updating an existing user"""
+    
+    # Create a user first
+    created_user = create_test_user(grpc_stub, "Update User Test", 30)
+    assert created_user is not None
+    
+    # Update the user
+    updated_user = grpc_stub.AtualizarUsuario(AtualizarUsuarioRequest(
+        id_usuario=created_user.id,
+        nome="Updated User Name",
+        idade=35
+    ))
+    assert updated_user.id == created_user.id
+    assert updated_user.nome == "Updated User Name"
+    assert updated_user.idade == 35
+
+def test_delete_user(grpc_stub):
     """Test deleting a user"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Create a user first
-        created_user = create_test_user(stub, "Delete User Test", 40)
-        assert created_user is not None
-        
-        # Delete the user
-        delete_response = stub.DeletarUsuario(UsuarioRequest(id_usuario=created_user.id))
-        assert isinstance(delete_response, BooleanResponse)
-        assert hasattr(delete_response, 'success')
-        assert delete_response.success == True
-        
-        # Note: The gRPC service simulates deletion but doesn't actually remove from memory
-        # This is by design for demonstration purposes
-
-def test_get_nonexistent_user():
+    
+    # Create a user first
+    created_user = create_test_user(grpc_stub, "Delete User Test", 40)
+    assert created_user is not None
+    
+    # Delete the user
+    delete_response = grpc_stub.DeletarUsuario(UsuarioRequest(id_usuario=created_user.id))
+    assert isinstance(delete_response, BooleanResponse)
+    assert delete_response.success == True
+    
+    # Note: The gRPC service simulates deletion but doesn't actually remove from memory
+    # This is by design for demonstration purposes
+
+def test_get_nonexistent_user(grpc_stub):
     """Test getting a user that doesn't exist"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        with pytest.raises(grpc.RpcError) as exc_info:
-            stub.ObterUsuario(UsuarioRequest(id_usuario="nonexistent_id"))
-        assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
+    with pytest.raises(grpc.RpcError) as exc_info:
+        grpc_stub.ObterUsuario(NONEXISTENT_USER_REQ)
+    assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
 
 # ========== MUSICAS CRUD TESTS ==========
 
-def test_list_songs():
+def test_list_songs(songs_response):
     """Test listing songs"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        response = stub.ListarTodasMusicas(Empty())
-        assert isinstance(response, MusicasResponse)
-        assert hasattr(response, 'musicas')
-        assert len(response.musicas) > 0  # Verifica se tem músicas
-        for song in response.musicas:
-            assert isinstance(song, Musica)
-            assert hasattr(song, 'id')
-            assert hasattr(song, 'nome')
-            assert hasattr(song, 'artista')
-            assert hasattr(song, 'duracao_segundos')
-
-def test_create_song():
-    """Test creating a new song"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        created_song = stub.CriarMusica(CriarMusicaRequest(
-            nome="Test Song Create",
-            artista="Test Artist",
-            duracao_segundos=200
-        ))
-        assert created_song.nome == "Test Song Create"
-        assert created_song.artista == "Test Artist"
-        assert created_song.duracao_segundos == 200
-        assert created_song.id  # Verifica se tem ID
+    response = songs_response
+    assert isinstance(response, MusicasResponse)
+    assert len(response.musicas) > 0  # Verifica se tem músicas
+    assert all(isinstance(song, Musica) for song in response.musicas)
 
-def test_get_song():
+def test_create_song(grpc_stub):
+    """Test creating a new song"""
+    created_song = grpc_stub.CriarMusica(CriarMusicaRequest(
+        nome="Test Song Create",
+        artista="Test Artist",
+        duracao_segundos=200
+    ))
+    assert created_song.nome == "Test Song Create"
+    assert created_song.artista == "Test Artist"
+    assert created_song.duracao_segundos == 200
+    assert created_song.id  # Verifica se tem ID
+
+def test_get_song(grpc_stub, seed_song):
     """Test getting a specific song"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Create a song first
-        created_song = create_test_song(stub, "Get Song Test", "Get Artist", 150)
-        assert created_song is not None
-        
-        # Get the created song
-        retrieved_song = stub.ObterMusica(MusicaRequest(id_musica=created_song.id))
-        assert retrieved_song.id == created_song.id
-        assert retrieved_song.nome == "Get Song Test"
-        assert retrieved_song.artista == "Get Artist"
-        assert retrieved_song.duracao_segundos == 150
-
-def test_update_song():
-    """Test updating an existing song"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Create a song first
-        created_song = create_test_song(stub, "Update Song Test", "Original Artist", 180)
-        assert created_song is not None
-        
-        # Update the song
-        updated_song = stub.AtualizarMusica(AtualizarMusicaRequest(
-            id_musica=created_song.id,
-            nome="Updated Song Name",
-            artista="Updated Artist",
-            duracao_segundos=220
-        ))
-        assert updated_song.id == created_song.id
-        assert updated_song.nome == "Updated Song Name"
-        assert updated_song.artista == "Updated Artist"
-        assert updated_song.duracao_segundos == 220
+    retrieved_song = grpc_stub.ObterMusica(MusicaRequest(id_musica=seed_song.id))
+    assert retrieved_song.id == seed_song.id
+    assert retrieved_song.nome == "Seed Song gRPC"
+    assert retrieved_song.artista == "Seed Artist"
+    assert retrieved_song.duracao_segundos == 150
 
-def test_delete_song():
+def test_update_song(grpc_stub):
+    """Test updating an existing song"""
+    
+    # Create a song first
+    created_song = create_test_song(grpc_stub, "Update Song Test", "Original Artist", 180)
+    assert created_song is not None
+    
+    # Update the song
+    updated_song = grpc_stub.AtualizarMusica(AtualizarMusicaRequest(
+        id_musica=created_song.id,
+        nome="Updated Song Name",
+        artista="Updated Artist",
+        duracao_segundos=220
+    ))
+    assert updated_song.id == created_song.id
+    assert updated_song.nome == "Updated Song Name"
+    assert updated_song.artista == "Updated Artist"
+    assert updated_song.duracao_segundos == 220
+
+def test_delete_song(grpc_stub):
     """Test deleting a song"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Create a song first
-        created_song = create_test_song(stub, "Delete Song Test", "Delete Artist", 120)
-        assert created_song is not None
-        
-        # Delete the song
-        delete_response = stub.DeletarMusica(MusicaRequest(id_musica=created_song.id))
-        assert isinstance(delete_response, BooleanResponse)
-        assert hasattr(delete_response, 'success')
-        assert delete_response.success == True
-        
-        # Note: The gRPC service simulates deletion but doesn't actually remove from memory
-        # This is by design for demonstration purposes
-
-def test_get_nonexistent_song():
+    
+    # Create a song first
+    created_song = create_test_song(grpc_stub, "Delete Song Test", "Delete Artist", 120)
+    assert created_song is not None
+    
+    # Delete the song
+    delete_response = grpc_stub.DeletarMusica(MusicaRequest(id_musica=created_song.id))
+    assert isinstance(delete_response, BooleanResponse)
+    assert delete_response.success == True
+    
+    # Note: The gRPC service simulates deletion but doesn't actually remove from memory
+    # This is by design for demonstration purposes
+
+def test_get_nonexistent_song(grpc_stub):
     """Test getting a song that doesn't exist"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        with pytest.raises(grpc.RpcError) as exc_info:
-            stub.ObterMusica(MusicaRequest(id_musica="nonexistent_id"))
-        assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
+    with pytest.raises(grpc.RpcError) as exc_info:
+        grpc_stub.ObterMusica(NONEXISTENT_SONG_REQ)
+    assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
 
 # ========== PLAYLISTS CRUD TESTS ==========
 
-def test_list_playlists():
+def test_list_playlists(grpc_stub, any_user_id):
     """Test listing playlists for a user"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        users_response = stub.ListarTodosUsuarios(Empty())
-        user_id = next(iter(users_response.usuarios)).id
-        
-        response = stub.ListarPlaylistsUsuario(UsuarioRequest(id_usuario=user_id))
-        assert isinstance(response, PlaylistsResponse)
-        assert hasattr(response, 'playlists')
-        # Pode retornar 0 playlists se o usuário não tem nenhuma
-        for playlist in response.playlists:
-            assert isinstance(playlist, Playlist)
-            assert hasattr(playlist, 'id')
-            assert hasattr(playlist, 'nome')
-            assert hasattr(playlist, 'id_usuario')
-            assert hasattr(playlist, 'musicas')
-
-def test_create_playlist():
+    user_id = any_user_id
+    
+    response = grpc_stub.ListarPlaylistsUsuario(UsuarioRequest(id_usuario=user_id))
+    assert isinstance(response, PlaylistsResponse)
+    # Pode retornar 0 playlists se o usuário não tem nenhuma
+    assert all(isinstance(playlist, Playlist) for playlist in response.playlists)
+
+def test_create_playlist(grpc_stub, any_user_id, some_song_ids):
     """Test creating a playlist"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Get a user and some songs for the playlist
-        users_response = stub.ListarTodosUsuarios(Empty())
-        user_id = next(iter(users_response.usuarios)).id
-        
-        songs_response = stub.ListarTodasMusicas(Empty())
-        song_ids = [song.id for song in songs_response.musicas[:2]]  # First 2 songs
-        
-        # Create playlist
-        created_playlist = stub.CriarPlaylist(CriarPlaylistRequest(
-            nome="Test Playlist Create",
-            id_usuario=user_id,
-            musicas=song_ids
-        ))
-        
-        assert created_playlist.nome == "Test Playlist Create"
-        assert created_playlist.id_usuario == user_id
-        assert len(created_playlist.musicas) == 2
-        assert created_playlist.id  # Verifica se tem ID
+    
+    # Get a user and some songs for the playlist
+    user_id = any_user_id
+    
+    song_ids = some_song_ids[:2]  # First 2 songs
+    
+    # Create playlist
+    created_playlist = grpc_stub.CriarPlaylist(CriarPlaylistRequest(
+        nome="Test Playlist Create",
+        id_usuario=user_id,
+        musicas=song_ids
+    ))
+    
+    assert created_playlist.nome == "Test Playlist Create"
+    assert created_playlist.id_usuario == user_id
+    assert len(created_playlist.musicas) == 2
+    assert created_playlist.id  # Verifica se tem ID
 
-def test_get_playlist():
+def test_get_playlist(grpc_stub, seed_playlist):
     """Test getting a specific playlist"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Create a playlist first
-        created_playlist = create_test_playlist(stub, "Get Playlist Test")
-        assert created_playlist is not None
-        
-        # Get the created playlist
-        retrieved_playlist = stub.ObterPlaylist(PlaylistRequest(id_playlist=created_playlist.id))
-        assert retrieved_playlist.id == created_playlist.id
-        assert retrieved_playlist.nome == "Get Playlist Test"
-        assert retrieved_playlist.id_usuario == created_playlist.id_usuario
-
-def test_update_playlist():
-    """Test updating an existing playlist"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Create a playlist first
-        created_playlist = create_test_playlist(stub, "Update Playlist Test")
-        assert created_playlist is not None
-        
-        # Get some songs for the update
-        songs_response = stub.ListarTodasMusicas(Empty())
-        song_ids = [song.id for song in songs_response.musicas[:3]]  # First 3 songs
-        
-        # Update the playlist
-        updated_playlist = stub.AtualizarPlaylist(AtualizarPlaylistRequest(
-            id_playlist=created_playlist.id,
-            nome="Updated Playlist Name",
-            musicas=song_ids
-        ))
-        assert updated_playlist.id == created_playlist.id
-        assert updated_playlist.nome == "Updated Playlist Name"
-        assert len(updated_playlist.musicas) == 3
+    retrieved_playlist = grpc_stub.ObterPlaylist(PlaylistRequest(id_playlist=seed_playlist.id))
+    assert retrieved_playlist.id == seed_playlist.id
+    assert retrieved_playlist.nome == "Seed Playlist gRPC"
+    assert retrieved_playlist.id_usuario == seed_playlist.id_usuario
 
-def test_delete_playlist():
+def test_update_playlist(grpc_stub, seed_user, some_song_ids):
+    """Test updating an existing playlist"""
+    
+    # Create a playlist first
+    created_playlist = create_test_playlist(grpc_stub, seed_user.id, "Update Playlist Test")
+    assert created_playlist is not None
+    
+    # Get some songs for the update
+    song_ids = some_song_ids[:3]  # First 3 songs
+    
+    # Update the playlist
+    updated_playlist = grpc_stub.AtualizarPlaylist(AtualizarPlaylistRequest(
+        id_playlist=created_playlist.id,
+        nome="Updated Playlist Name",
+        musicas=song_ids
+    ))
+    assert updated_playlist.id == created_playlist.id
+    assert updated_playlist.nome == "Updated Playlist Name"
+    assert len(updated_playlist.musicas) == 3
+
+def test_delete_playlist(grpc_stub, seed_user):
     """Test deleting a playlist"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Create a playlist first
-        created_playlist = create_test_playlist(stub, "Delete Playlist Test")
-        assert created_playlist is not None
-        
-        # Delete the playlist
-        delete_response = stub.DeletarPlaylist(PlaylistRequest(id_playlist=created_playlist.id))
-        assert isinstance(delete_response, BooleanResponse)
-        assert hasattr(delete_response, 'success')
-        assert delete_response.success == True
-        
-        # Note: The gRPC service simulates deletion but doesn't actually remove from memory
-        # This is by design for demonstration purposes
-
-def test_get_nonexistent_playlist():
+    
+    # Create a playlist first
+    created_playlist = create_test_playlist(grpc_stub, seed_user.id, "Delete Playlist Test")
+    assert created_playlist is not None
+    
+    # Delete the playlist
+    delete_response = grpc_stub.DeletarPlaylist(PlaylistRequest(id_playlist=created_playlist.id))
+    assert isinstance(delete_response, BooleanResponse)
+    assert delete_response.success == True
+    
+    # Note: The gRPC service simulates deletion but doesn't actually remove from memory
+    # This is by design for demonstration purposes
+
+def test_get_nonexistent_playlist(grpc_stub):
     """Test getting a playlist that doesn't exist"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        with pytest.raises(grpc.RpcError) as exc_info:
-            stub.ObterPlaylist(PlaylistRequest(id_playlist="nonexistent_id"))
-        assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
+    with pytest.raises(grpc.RpcError) as exc_info:
+        grpc_stub.ObterPlaylist(NONEXISTENT_PLAYLIST_REQ)
+    assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
 
 # ========== SPECIFIC GRPC OPERATIONS TESTS ==========
 
-def test_list_playlist_songs():
+def test_list_playlist_songs(grpc_stub, seed_playlist, some_song_ids):
     """Test listing songs from a specific playlist"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Get some songs and create a playlist with them
-        songs_response = stub.ListarTodasMusicas(Empty())
-        song_ids = [song.id for song in songs_response.musicas[:2]]
-        
-        created_playlist = create_test_playlist(stub, "Songs Test Playlist", musicas=song_ids)
-        assert created_playlist is not None
-        
-        # List songs from the playlist
-        playlist_songs = stub.ListarMusicasPlaylist(PlaylistRequest(id_playlist=created_playlist.id))
-        assert isinstance(playlist_songs, MusicasResponse)
-        assert len(playlist_songs.musicas) == 2
-        
-        # Verify the songs are the ones we added
-        playlist_song_ids = [song.id for song in playlist_songs.musicas]
-        for song_id in song_ids:
-            assert song_id in playlist_song_ids
-
-def test_list_playlists_with_song():
+    song_ids = some_song_ids[:2]
+    playlist_songs = grpc_stub.ListarMusicasPlaylist(PlaylistRequest(id_playlist=seed_playlist.id))
+    assert isinstance(playlist_songs, MusicasResponse)
+    assert len(playlist_songs.musicas) == 2
+    
+    # Verify the songs are the ones we added
+    assert sorted(song.id for song in playlist_songs.musicas) == sorted(song_ids)
+
+def test_list_playlists_with_song(grpc_stub, seed_user, some_song_ids):
     """Test listing playlists that contain a specific song"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Get a song and create playlists with it
-        songs_response = stub.ListarTodasMusicas(Empty())
-        song_id = songs_response.musicas[0].id
-        
-        # Create two playlists with the same song
-        playlist1 = create_test_playlist(stub, "Playlist With Song 1", musicas=[song_id])
-        playlist2 = create_test_playlist(stub, "Playlist With Song 2", musicas=[song_id])
-        
-        assert playlist1 is not None
-        assert playlist2 is not None
-        
-        # List playlists that contain the song
-        playlists_with_song = stub.ListarPlaylistsComMusica(MusicaRequest(id_musica=song_id))
-        assert isinstance(playlists_with_song, PlaylistsResponse)
-        
-        # Verify our created playlists are in the result
-        playlist_ids = [p.id for p in playlists_with_song.playlists]
-        assert playlist1.id in playlist_ids
-        assert playlist2.id in playlist_ids
-
-def test_stream_songs():
+    
+    # Get a song and create playlists with it
+    song_id = some_song_ids[0]
+    
+    # Create two playlists with the same song
+    playlist1 = create_test_playlist(grpc_stub, seed_user.id, "Playlist With Song 1", musicas=[song_id])
+    playlist2 = create_test_playlist(grpc_stub, seed_user.id, "Playlist With Song 2", musicas=[song_id])
+    
+    assert playlist1 is not None
+    assert playlist2 is not None
+    
+    # List playlists that contain the song
+    playlists_with_song = grpc_stub.ListarPlaylistsComMusica(MusicaRequest(id_musica=song_id))
+    assert isinstance(playlists_with_song, PlaylistsResponse)
+    
+    # Verify our created playlists are in the result
+    playlist_ids = [p.id for p in playlists_with_song.playlists]
+    assert playlist1.id in playlist_ids
+    assert playlist2.id in playlist_ids
+
+def test_stream_songs(grpc_stub, some_song_ids):
     """Test streaming songs functionality"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Get some song IDs
-        songs_response = stub.ListarTodasMusicas(Empty())
-        song_ids = [song.id for song in songs_response.musicas[:3]]
-        
-        # Create stream requests - using generator that yields MusicaRequest
-        def generate_requests():
-            for song_id in song_ids:
-                yield MusicaRequest(id_musica=song_id)
-        
-        # Stream the songs
-        streamed_songs = list(stub.StreamMusicas(generate_requests()))
-        assert len(streamed_songs) == 3
-        
-        # Verify we got the correct songs
-        streamed_song_ids = [song.id for song in streamed_songs]
-        for song_id in song_ids:
-            assert song_id in streamed_song_ids
+    
+    # Get some song IDs
+    song_ids = some_song_ids[:3]
+    
+    # Build the stream requests up front and consume the replies in one pass
+    requests = [MusicaRequest(id_musica=song_id) for song_id in song_ids]
+    streamed_song_ids = [song.id for song in grpc_stub.StreamMusicas(iter(requests))]
+    assert len(streamed_song_ids) == 3
+    
+    # Verify we got the correct songs
+    assert sorted(streamed_song_ids) == sorted(song_ids)
 
 # ========== COMPLETE WORKFLOW TESTS ==========
 
-def test_create_and_get_user():
+def test_create_and_get_user(grpc_stub):
     """Test creating a new user and retrieving it"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Create user
-        created_user = stub.CriarUsuario(CriarUsuarioRequest(nome="Test User gRPC", idade=25))
-        assert created_user.nome == "Test User gRPC"
-        assert created_user.idade == 25
-        assert created_user.id  # Verifica se tem ID
-        
-        # Get user
-        retrieved_user = stub.ObterUsuario(UsuarioRequest(id_usuario=created_user.id))
-        assert retrieved_user.id == created_user.id
-        assert retrieved_user.nome == "Test User gRPC"
-        assert retrieved_user.idade == 25
-
-def test_create_and_get_playlist():
+    
+    # Create user
+    created_user = grpc_stub.CriarUsuario(CriarUsuarioRequest(nome="Test User gRPC", idade=25))
+    assert created_user.nome == "Test User gRPC"
+    assert created_user.idade == 25
+    assert created_user.id  # Verifica se tem ID
+    
+    # Get user
+    retrieved_user = grpc_stub.ObterUsuario(UsuarioRequest(id_usuario=created_user.id))
+    assert retrieved_user.id == created_user.id
+    assert retrieved_user.nome == "Test User gRPC"
+    assert retrieved_user.idade == 25
+
+def test_create_and_get_playlist(grpc_stub, any_user_id, some_song_ids):
     """Test creating a playlist and retrieving its songs"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Get a user and some songs for the playlist
-        users_response = stub.ListarTodosUsuarios(Empty())
-        user_id = next(iter(users_response.usuarios)).id
-        
-        songs_response = stub.ListarTodasMusicas(Empty())
-        song_ids = [song.id for song in songs_response.musicas[:2]]  # First 2 songs
-        
-        # Create playlist
-        created_playlist = stub.CriarPlaylist(CriarPlaylistRequest(
-            nome="Test Playlist gRPC",
-            id_usuario=user_id,
-            musicas=song_ids
-        ))
-        
-        assert created_playlist.nome == "Test Playlist gRPC"
-        assert created_playlist.id_usuario == user_id
-        assert len(created_playlist.musicas) == 2
-        assert created_playlist.id  # Verifica se tem ID
-        
-        # Get playlist
-        retrieved_playlist = stub.ObterPlaylist(PlaylistRequest(id_playlist=created_playlist.id))
-        assert retrieved_playlist.id == created_playlist.id
-        assert retrieved_playlist.nome == "Test Playlist gRPC"
-        assert retrieved_playlist.id_usuario == user_id
-        assert len(retrieved_playlist.musicas) == 2
+    
+    # Get a user and some songs for the playlist
+    user_id = any_user_id
+    
+    song_ids = some_song_ids[:2]  # First 2 songs
+    
+    # Create playlist
+    created_playlist = grpc_stub.CriarPlaylist(CriarPlaylistRequest(
+        nome="Test Playlist gRPC",
+        id_usuario=user_id,
+        musicas=song_ids
+    ))
+    
+    assert created_playlist.nome == "Test Playlist gRPC"
+    assert created_playlist.id_usuario == user_id
+    assert len(created_playlist.musicas) == 2
+    assert created_playlist.id  # Verifica se tem ID
+    
+    # Get playlist
+    retrieved_playlist = grpc_stub.ObterPlaylist(PlaylistRequest(id_playlist=created_playlist.id))
+    assert retrieved_playlist.id == created_playlist.id
+    assert retrieved_playlist.nome == "Test Playlist gRPC"
+    assert retrieved_playlist.id_usuario == user_id
+    assert len(retrieved_playlist.musicas) == 2
 
 # ========== VALIDATION AND ERROR TESTS ==========
 
-def test_create_user_invalid_data():
+def test_create_user_invalid_data(grpc_stub):
     """Test creating user with invalid data"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Test empty name
+    futures = [
+        # Empty name
+        grpc_stub.CriarUsuario.future(CriarUsuarioRequest(nome="", idade=25)),
+        # Invalid age
+        grpc_stub.CriarUsuario.future(CriarUsuarioRequest(nome="Test", idade=-1)),
+    ]
+    for future in futures:
         with pytest.raises(grpc.RpcError) as exc_info:
-            stub.CriarUsuario(CriarUsuarioRequest(nome="", idade=25))
-        assert exc_info.value.code() == grpc.StatusCode.INVALID_ARGUMENT
-        
-        # Test invalid age
-        with pytest.raises(grpc.RpcError) as exc_info:
-            stub.CriarUsuario(CriarUsuarioRequest(nome="Test", idade=-1))
+            future.result()
         assert exc_info.value.code() == grpc.StatusCode.INVALID_ARGUMENT
 
-def test_create_song_invalid_data():
+def test_create_song_invalid_data(grpc_stub):
     """Test creating song with invalid data"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Test empty name
-        with pytest.raises(grpc.RpcError) as exc_info:
-            stub.CriarMusica(CriarMusicaRequest(nome="", artista="Artist", duracao_segundos=180))
-        assert exc_info.value.code() == grpc.StatusCode.INVALID_ARGUMENT
-        
-        # Test invalid duration
+    futures = [
+        # Empty name
+        grpc_stub.CriarMusica.future(CriarMusicaRequest(nome="", artista="Artist", duracao_segundos=180)),
+        # Invalid duration
+        grpc_stub.CriarMusica.future(CriarMusicaRequest(nome="Song", artista="Artist", duracao_segundos=-1)),
+    ]
+    for future in futures:
         with pytest.raises(grpc.RpcError) as exc_info:
-            stub.CriarMusica(CriarMusicaRequest(nome="Song", artista="Artist", duracao_segundos=-1))
+            future.result()
         assert exc_info.value.code() == grpc.StatusCode.INVALID_ARGUMENT
 
-def test_create_playlist_invalid_user():
+def test_create_playlist_invalid_user(grpc_stub):
     """Test creating playlist with invalid user"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        with pytest.raises(grpc.RpcError) as exc_info:
-            stub.CriarPlaylist(CriarPlaylistRequest(
-                nome="Test Playlist",
-                id_usuario="nonexistent_user",
-                musicas=[]
-            ))
-        assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
+    
+    with pytest.raises(grpc.RpcError) as exc_info:
+        grpc_stub.CriarPlaylist(CriarPlaylistRequest(
+            nome="Test Playlist",
+            id_usuario="nonexistent_user",
+            musicas=[]
+        ))
+    assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
 
-def test_update_nonexistent_resources():
+def test_update_nonexistent_resources(grpc_stub):
     """Test updating resources that don't exist"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Test update nonexistent user
-        with pytest.raises(grpc.RpcError) as exc_info:
-            stub.AtualizarUsuario(AtualizarUsuarioRequest(
-                id_usuario="nonexistent_id",
-                nome="Updated Name",
-                idade=30
-            ))
-        assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
-        
-        # Test update nonexistent song
-        with pytest.raises(grpc.RpcError) as exc_info:
-            stub.AtualizarMusica(AtualizarMusicaRequest(
-                id_musica="nonexistent_id",
-                nome="Updated Song",
-                artista="Updated Artist",
-                duracao_segundos=180
-            ))
-        assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
-        
-        # Test update nonexistent playlist
+    # The three calls are independent: start them together on the channel
+    futures = [
+        grpc_stub.AtualizarUsuario.future(AtualizarUsuarioRequest(
+            id_usuario="nonexistent_id",
+            nome="Updated Name",
+            idade=30
+        )),
+        grpc_stub.AtualizarMusica.future(AtualizarMusicaRequest(
+            id_musica="nonexistent_id",
+            nome="Updated Song",
+            artista="Updated Artist",
+            duracao_segundos=180
+        )),
+        grpc_stub.AtualizarPlaylist.future(AtualizarPlaylistRequest(
+            id_playlist="nonexistent_id",
+            nome="Updated Playlist",
+            musicas=[]
+        )),
+    ]
+    for future in futures:
         with pytest.raises(grpc.RpcError) as exc_info:
-            stub.AtualizarPlaylist(AtualizarPlaylistRequest(
-                id_playlist="nonexistent_id",
-                nome="Updated Playlist",
-                musicas=[]
-            ))
+            future.result()
         assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
 
-def test_delete_nonexistent_resources():
+def test_delete_nonexistent_resources(grpc_stub):
     """Test deleting resources that don't exist"""
-    with create_channel() as channel:
-        stub = StreamingServiceStub(channel)
-        
-        # Test delete nonexistent user
-        with pytest.raises(grpc.RpcError) as exc_info:
-            stub.DeletarUsuario(UsuarioRequest(id_usuario="nonexistent_id"))
-        assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
-        
-        # Test delete nonexistent song
-        with pytest.raises(grpc.RpcError) as exc_info:
-            stub.DeletarMusica(MusicaRequest(id_musica="nonexistent_id"))
-        assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
-        
-        # Test delete nonexistent playlist
+    futures = [
+        grpc_stub.DeletarUsuario.future(NONEXISTENT_USER_REQ),
+        grpc_stub.DeletarMusica.future(NONEXISTENT_SONG_REQ),
+        grpc_stub.DeletarPlaylist.future(NONEXISTENT_PLAYLIST_REQ),
+    ]
+    for future in futures:
         with pytest.raises(grpc.RpcError) as exc_info:
-            stub.DeletarPlaylist(PlaylistRequest(id_playlist="nonexistent_id"))
+            future.result()
         assert exc_info.value.code() == grpc.StatusCode.NOT_FOUND
 
 if __name__ == "__main__":
     print("Starting comprehensive gRPC service tests...")
     print("Make sure the gRPC service is running on localhost:50051")
-    print("Running tests in 5 seconds...")
-    time.sleep(5)
     pytest.main([__file__, "-v"]) 
\ No newline at end of file
@@ -1,62 +1,129 @@
+import json
+import os
+import tempfile
+import time
 import pytest
 import requests
-import time
-from typing import Dict, List
+from http_pool import SESSION as _SESSION
+from lxml import etree
 from zeep import Client
+from zeep.cache import SqliteCache
 from zeep.transports import Transport
 
+try:
+    from orjson import loads as _loads
+except ImportError:  # stdlib fallback
+    _loads = json.loads
+
 # Base URL for the SOAP service
 BASE_URL = "http://localhost:8004/soap?wsdl"
 
-def get_soap_client():
-    """Create and return a SOAP client"""
-    transport = Transport(timeout=60)
+# WSDL/XSD cache on disk, reused between runs (TTL in seconds)
+ZEEP_CACHE_PATH = os.environ.get(
+    "ZEEP_CACHE_PATH", os.path.join(tempfile.gettempdir(), "zeep_streaming.db"))
+ZEEP_CACHE_TTL = int(os.environ.get("ZEEP_CACHE_TTL", "3600"))
+
+# Raw SOAP endpoint and namespace, for smoke tests that skip zeep's marshalling
+SOAP_URL = "http://localhost:8004/soap"
+TNS = "http://streaming.soap.service"
+SOAP_HEADERS = {"Content-Type": "text/xml; charset=utf-8", "SOAPAction": ""}
+
+def _envelope(operacao):
+    """Pre-built envelope for a parameterless operation"""
+    return (
+        '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" '
+        f'xmlns:t="{TNS}"><soap:Body><t:{operacao}/></soap:Body></soap:Envelope>'
+    ).encode()
+
+ENV_OBTER_ESTATISTICAS = _envelope("obter_estatisticas")
+ENV_LISTAR_USUARIOS = _envelope("listar_usuarios")
+ENV_LISTAR_MUSICAS = _envelope("listar_musicas")
+ENV_LISTAR_PLAYLISTS = _envelope("listar_playlists")
+
+# XPath expressions compiled once at import and reused by every assertion
+NS = {"t": TNS}
+RESULT_XPATH = {
+    operacao: etree.XPath(f"/*/*/t:{operacao}Response/t:{operacao}Result", namespaces=NS)
+    for operacao in ("obter_estatisticas", "listar_usuarios", "listar_musicas", "listar_playlists")
+}
+TECNOLOGIA_XPATH = etree.XPath("string(t:tecnologia)", namespaces=NS)
+# Children of a list result whose element is not the expected type
+FOREIGN_ITEMS_XPATH = etree.XPath("*[local-name() != $tipo]")
+
+@pytest.fixture(scope="module")
+def soap_client():
+    """SOAP client shared by the whole module (WSDL fetched and parsed once)"""
+    cache = SqliteCache(path=ZEEP_CACHE_PATH, timeout=ZEEP_CACHE_TTL)
+    transport = Transport(timeout=60, operation_timeout=60, session=_SESSION, cache=cache)
     return Client(BASE_URL, transport=transport)
 
+@pytest.fixture(scope="module")
+def users(soap_client):
+    """Full user list, fetched once per module"""
+    return soap_client.service.listar_usuarios()
+
+@pytest.fixture(scope="module")
+def playlists(soap_client):
+    """Full playlist list, fetched once per module"""
+    return soap_client.service.listar_playlists()
+
+@pytest.fixture(scope="module")
+def first_playlist_songs(soap_client, playlists):
+    """Id and songs of the first listed playlist"""
+    playlist_id = playlists[0].id
+    return playlist_id, soap_client.service.listar_musicas_playlist(playlist_id)
+
+@pytest.fixture(scope="module")
+def scratch_user(soap_client):
+    """User created once per module to own the playlists the tests create"""
+    return soap_client.service.criar_usuario(nome="Scratch Playlist Owner", idade=30)
+
+def raw_soap_result(envelope, operacao):
+    """POST a pre-built envelope and return the operation's Result element"""
+    response = _SESSION.post(SOAP_URL, data=envelope, headers=SOAP_HEADERS)
+    assert response.status_code == 200
+    results = RESULT_XPATH[operacao](etree.fromstring(response.content))
+    return results[0] if results else None
+
 def test_service_is_running():
     """Test if the SOAP service is running and accessible"""
-    client = get_soap_client()
     # Try to get stats as a simple health check
-    response = client.service.obter_estatisticas()
-    assert response is not None
+    result = raw_soap_result(ENV_OBTER_ESTATISTICAS, "obter_estatisticas")
+    assert result is not None
+    assert TECNOLOGIA_XPATH(result) == "SOAP"
 
 def test_list_users():
     """Test listing users"""
-    client = get_soap_client()
-    response = client.service.listar_usuarios()
-    assert response is not None
-    assert isinstance(response, list)
+    result = raw_soap_result(ENV_LISTAR_USUARIOS, "listar_usuarios")
+    assert result is not None
+    assert len(result) > 0
+    assert FOREIGN_ITEMS_XPATH(result, tipo="Usuario") == []
 
 def test_list_songs():
     """Test listing songs"""
-    client = get_soap_client()
-    response = client.service.listar_musicas()
-    assert response is not None
-    assert isinstance(response, list)
+    result = raw_soap_result(ENV_LISTAR_MUSICAS, "listar_musicas")
+    assert result is not None
+    assert len(result) > 0
+    assert FOREIGN_ITEMS_XPATH(result, tipo="Musica") == []
 
 def test_list_playlists():
     """Test listing playlists"""
-    client = get_soap_client()
-    response = client.service.listar_playlists()
-    assert response is not None
-    assert isinstance(response, list)
+    result = raw_soap_result(ENV_LISTAR_PLAYLISTS, "listar_playlists")
+    assert result is not None
+    assert len(result) > 0
+    assert FOREIGN_ITEMS_XPATH(result, tipo="Playlist") == []
 
-def test_listar_playlists_usuario():
+def test_listar_playlists_usuario(soap_client, users):
     """Test listing playlists for a specific user"""
-    client = get_soap_client()
-    usuarios = client.service.listar_usuarios()
-    user_id = usuarios[0].id
-    playlists = client.service.listar_playlists_usuario(user_id)
+    user_id = users[0].id
+    playlists = soap_client.service.listar_playlists_usuario(user_id)
     assert isinstance(playlists, list)
     for playlist in playlists:
         assert playlist.usuario == user_id
 
-def test_listar_musicas_playlist():
+def test_listar_musicas_playlist(first_playlist_songs):
     """Test listing songs for a playlist"""
-    client = get_soap_client()
-    playlists = client.service.listar_playlists()
-    playlist_id = playlists[0].id
-    musicas = client.service.listar_musicas_playlist(playlist_id)
+    playlist_id, musicas = first_playlist_songs
     assert isinstance(musicas, list)
     for musica in musicas:
         assert hasattr(musica, 'id')
@@ -64,32 +131,29 @@ def test_listar_musicas_playlist():
         assert hasattr(musica, 'artista')
         assert hasattr(musica, 'duracao')
 
-def test_listar_playlists_com_musica():
+def test_listar_playlists_com_musica(soap_client, first_playlist_songs):
     """Test listing playlists containing a song"""
-    client = get_soap_client()
-    playlists = client.service.listar_playlists()
-    playlist_id = playlists[0].id
-    musicas = client.service.listar_musicas_playlist(playlist_id)
+    playlist_id, musicas = first_playlist_songs
     assert len(musicas) > 0
     musica_id = musicas[0].id
-    playlists_with_song = client.service.listar_playlists_com_musica(musica_id)
+    playlists_with_song = soap_client.service.listar_playlists_com_musica(musica_id)
     assert isinstance(playlists_with_song, list)
     assert any(p.id == playlist_id for p in playlists_with_song)
 
-def test_criar_musica():
+@pytest.mark.mutating
+def test_criar_musica(soap_client):
     """Test creating a new song"""
-    client = get_soap_client()
-    nova_musica = client.service.criar_musica('Teste Song', 'Tester', 180)
+    nova_musica = soap_client.service.criar_musica('Teste Song', 'Tester', 180)
     assert nova_musica.nome == 'Teste Song'
-    musicas = client.service.listar_musicas()
+    musicas = soap_client.service.listar_musicas()
     assert any(m.id == nova_musica.id for m in musicas)
 
-def test_create_and_get_user():
+@pytest.mark.mutating
+def test_create_and_get_user(soap_client):
     """Test creating a new user and retrieving it"""
-    client = get_soap_client()
     
     # Create a new user
-    created_user = client.service.criar_usuario(
+    created_user = soap_client.service.criar_usuario(
         nome="Test User",
         idade=25
     )
@@ -98,23 +162,18 @@ def test_create_and_get_user():
     assert created_user.idade == 25
     
     # Get the created user
-    retrieved_user = client.service.obter_usuario(id_usuario=created_user.id)
+    retrieved_user = soap_client.service.obter_usuario(id_usuario=created_user.id)
     assert retrieved_user is not None
     assert retrieved_user.id == created_user.id
     assert retrieved_user.nome == "Test User"
 
-def test_create_and_get_playlist():
+@pytest.mark.mutating
+def test_create_and_get_playlist(soap_client, scratch_user):
     """Test creating a playlist and retrieving its songs"""
-    client = get_soap_client()
-    
-    # First create a user
-    user = client.service.criar_usuario(
-        nome="Playlist Creator",
-        idade=30
-    )
+    user = scratch_user
     
     # Create a playlist
-    created_playlist = client.service.criar_playlist(
+    created_playlist = soap_client.service.criar_playlist(
         nome="Test Playlist",
         id_usuario=user.id,
         musicas=[]  # Empty playlist for testing
@@ -123,15 +182,14 @@ def test_create_and_get_playlist():
     assert created_playlist.nome == "Test Playlist"
     
     # Get the playlist
-    retrieved_playlist = client.service.obter_playlist(id_playlist=created_playlist.id)
+    retrieved_playlist = soap_client.service.obter_playlist(id_playlist=created_playlist.id)
     assert retrieved_playlist is not None
     assert retrieved_playlist.id == created_playlist.id
     assert retrieved_playlist.nome == "Test Playlist"
 
-def test_service_stats():
+def test_service_stats(soap_client):
     """Test the stats endpoint"""
-    client = get_soap_client()
-    response = client.service.obter_estatisticas()
+    response = soap_client.service.obter_estatisticas()
     assert response is not None
     assert hasattr(response, 'total_usuarios')
     assert hasattr(response, 'total_musicas')
@@ -142,18 +200,18 @@ def test_service_stats():
 
 # ========== UPDATE TESTS ==========
 
-def test_update_user():
+@pytest.mark.mutating
+def test_update_user(soap_client):
     """Test updating an existing user"""
-    client = get_soap_client()
     
     # Create a user to update
-    created_user = client.service.criar_usuario(
+    created_user = soap_client.service.criar_usuario(
         nome="Update Test User",
         idade=25
     )
     
     # Update the user
-    updated_user = client.service.atualizar_usuario(
+    updated_user = soap_client.service.atualizar_usuario(
         id_usuario=created_user.id,
         nome="Updated User Name",
         idade=30
@@ -163,15 +221,15 @@ def test_update_user():
     assert updated_user.nome == "Updated User Name"
     assert updated_user.idade == 30
 
-def test_update_song():
+@pytest.mark.mutating
+def test_update_song(soap_client):
     """Test updating an existing song"""
-    client = get_soap_client()
     
     # Create a song to update
-    created_song = client.service.criar_musica("Update Test Song", "Test Artist", 180)
+    created_song = soap_client.service.criar_musica("Update Test Song", "Test Artist", 180)
     
     # Update the song
-    updated_song = client.service.atualizar_musica(
+    updated_song = soap_client.service.atualizar_musica(
         id_musica=created_song.id,
         nome="Updated Song Name",
         artista="Updated Artist",
@@ -183,20 +241,20 @@ def test_update_song():
     assert updated_song.artista == "Updated Artist"
     assert updated_song.duracao == 200
 
-def test_update_playlist():
+@pytest.mark.mutating
+def test_update_playlist(soap_client, scratch_user):
     """Test updating an existing playlist"""
-    client = get_soap_client()
     
-    # Create a user and playlist to update
-    user = client.service.criar_usuario(nome="Playlist Update User", idade=30)
-    created_playlist = client.service.criar_playlist(
+    # Create a playlist to update
+    user = scratch_user
+    created_playlist = soap_client.service.criar_playlist(
         nome="Update Test Playlist",
         id_usuario=user.id,
         musicas=[]
     )
     
     # Update the playlist
-    updated_playlist = client.service.atualizar_playlist(
+    updated_playlist = soap_client.service.atualizar_playlist(
         id_playlist=created_playlist.id,
         nome="Updated Playlist Name",
         musicas=[]
@@ -207,75 +265,72 @@ def test_update_playlist():
 
 # ========== DELETE TESTS ==========
 
-def test_delete_user():
+@pytest.mark.mutating
+def test_delete_user(soap_client):
     """Test deleting a user"""
-    client = get_soap_client()
     
     # Create a user to delete
-    created_user = client.service.criar_usuario(
+    created_user = soap_client.service.criar_usuario(
         nome="Delete Test User",
         idade=40
     )
     
     # Delete the user
-    result = client.service.deletar_usuario(id_usuario=created_user.id)
+    result = soap_client.service.deletar_usuario(id_usuario=created_user.id)
     assert result == True
 
-def test_delete_song():
+@pytest.mark.mutating
+def test_delete_song(soap_client):
     """Test deleting a song"""
-    client = get_soap_client()
     
     # Create a song to delete
-    created_song = client.service.criar_musica("Delete Test Song", "Delete Artist", 120)
+    created_song = soap_client.service.criar_musica("Delete Test Song", "Delete Artist", 120)
     
     # Delete the song
-    result = client.service.deletar_musica(id_musica=created_song.id)
+    result = soap_client.service.deletar_musica(id_musica=created_song.id)
     assert result == True
 
-def test_delete_playlist():
+@pytest.mark.mutating
+def test_delete_playlist(soap_client, scratch_user):
     """Test deleting a playlist"""
-    client = get_soap_client()
     
-    # Create a user and playlist to delete
-    user = client.service.criar_usuario(nome="Playlist Delete User", idade=30)
-    created_playlist = client.service.criar_playlist(
+    # Create a playlist to delete
+    user = scratch_user
+    created_playlist = soap_client.service.criar_playlist(
         nome="Delete Test Playlist",
         id_usuario=user.id,
         musicas=[]
     )
     
     # Delete the playlist
-    result = client.service.deletar_playlist(id_playlist=created_playlist.id)
+    result = soap_client.service.deletar_playlist(id_playlist=created_playlist.id)
     assert result == True
 
 # ========== ERROR HANDLING TESTS ==========
 
-def test_get_nonexistent_user():
+def test_get_nonexistent_user(soap_client):
     """Test getting a user that doesn't exist"""
-    client = get_soap_client()
     
     # Try to get a user with non-existent ID
-    result = client.service.obter_usuario(id_usuario="nonexistent_user_id")
+    result = soap_client.service.obter_usuario(id_usuario="nonexistent_user_id")
     assert result is not None
     # Em SOAP, retorna objeto com campos None/vazios em vez de erro 404
     assert result.id == "" or result.id is None
     assert result.nome == "" or result.nome is None
 
-def test_get_nonexistent_song():
+def test_get_nonexistent_song(soap_client):
     """Test getting a song that doesn't exist"""
-    client = get_soap_client()
     
     # Note: SOAP service doesn't have obter_musica method, so we'll test with delete
     # Try to delete non-existent song as a way to test non-existent song handling
-    result = client.service.deletar_musica(id_musica="nonexistent_song_id")
+    result = soap_client.service.deletar_musica(id_musica="nonexistent_song_id")
     assert result == False
 
-def test_get_nonexistent_playlist():
+def test_get_nonexistent_playlist(soap_client):
     """Test getting a playlist that doesn't exist"""
-    client = get_soap_client()
     
     # Try to get a playlist with non-existent ID
-    result = client.service.obter_playlist(id_playlist="nonexistent_playlist_id")
+    result = soap_client.service.obter_playlist(id_playlist="nonexistent_playlist_id")
     # O Spyne/Zeep pode retornar None quando todos os campos do objeto são None
     if result is None:
         # Comportamento esperado: retorna None quando playlist não existe
@@ -288,15 +343,15 @@ def test_get_nonexistent_playlist():
 
 # ========== VALIDATION TESTS ==========
 
-def test_update_user_invalid_data():
+@pytest.mark.mutating
+def test_update_user_invalid_data(soap_client):
     """Test updating a user with invalid data"""
-    client = get_soap_client()
     
     # Create a user first
-    created_user = client.service.criar_usuario(nome="Valid User", idade=25)
+    created_user = soap_client.service.criar_usuario(nome="Valid User", idade=25)
     
     # Try to update with invalid data (empty name)
-    result = client.service.atualizar_usuario(
+    result = soap_client.service.atualizar_usuario(
         id_usuario=created_user.id,
         nome="",  # Empty name is allowed in this implementation
         idade=30
@@ -306,15 +361,15 @@ def test_update_user_invalid_data():
     assert result.nome is None or result.nome == ""  # SOAP pode retornar None ou string vazia
     assert result.idade == 30
 
-def test_update_song_invalid_data():
+@pytest.mark.mutating
+def test_update_song_invalid_data(soap_client):
     """Test updating a song with invalid data"""
-    client = get_soap_client()
     
     # Create a song first
-    created_song = client.service.criar_musica("Valid Song", "Valid Artist", 180)
+    created_song = soap_client.service.criar_musica("Valid Song", "Valid Artist", 180)
     
     # Try to update with invalid data (negative duration)
-    result = client.service.atualizar_musica(
+    result = soap_client.service.atualizar_musica(
         id_musica=created_song.id,
         nome="Updated Song",
         artista="Updated Artist",
@@ -326,12 +381,11 @@ def test_update_song_invalid_data():
     assert result.artista == "Updated Artist"
     assert result.duracao == -1  # Valor negativo é aceito
 
-def test_update_nonexistent_user():
+def test_update_nonexistent_user(soap_client):
     """Test updating a user that doesn't exist"""
-    client = get_soap_client()
     
     # Try to update non-existent user
-    result = client.service.atualizar_usuario(
+    result = soap_client.service.atualizar_usuario(
         id_usuario="nonexistent_id",
         nome="Some Name",
         idade=25
@@ -340,12 +394,11 @@ def test_update_nonexistent_user():
     assert result.id == "" or result.id is None
     assert result.nome == "" or result.nome is None
 
-def test_update_nonexistent_song():
+def test_update_nonexistent_song(soap_client):
     """Test updating a song that doesn't exist"""
-    client = get_soap_client()
     
     # Try to update non-existent song
-    result = client.service.atualizar_musica(
+    result = soap_client.service.atualizar_musica(
         id_musica="nonexistent_id",
         nome="Some Song",
         artista="Some Artist",
@@ -355,37 +408,75 @@ def test_update_nonexistent_song():
     assert result.id == "" or result.id is None
     assert result.nome == "" or result.nome is None
 
-def test_delete_nonexistent_user():
+def test_delete_nonexistent_user(soap_client):
     """Test deleting a user that doesn't exist"""
-    client = get_soap_client()
     
     # Try to delete non-existent user
-    result = client.service.deletar_usuario(id_usuario="nonexistent_id")
+    result = soap_client.service.deletar_usuario(id_usuario="nonexistent_id")
     assert result == False
 
-def test_delete_nonexistent_song():
+def test_delete_nonexistent_song(soap_client):
     """Test deleting a song that doesn't exist"""
-    client = get_soap_client()
     
     # Try to delete non-existent song
-    result = client.service.deletar_musica(id_musica="nonexistent_id")
+    result = soap_client.service.deletar_musica(id_musica="nonexistent_id")
     assert result == False
 
-def test_delete_nonexistent_playlist():
+def test_delete_nonexistent_playlist(soap_client):
     """Test deleting a playlist that doesn't exist"""
-    client = get_soap_client()
     
     # Try to delete non-existent playlist
-    result = client.service.deletar_playlist(id_playlist="nonexistent_id")
+    result = soap_client.service.deletar_playlist(id_playlist="nonexistent_id")
     assert result == False
 
 
+# ========== FAST-PATH JSON TESTS ==========
+
+FAST_URL = "http://localhost:8004/soap/fast"
+
+def rjson(response):
+    """Decode a fast-path body with the fastest available JSON parser"""
+    return _loads(response.content)
+
+def test_fast_path_stats():
+    """Test the JSON fast-path for stats"""
+    response = _SESSION.get(f"{FAST_URL}/obter_estatisticas")
+    assert response.status_code == 200
+    stats = rjson(response)
+    assert stats["tecnologia"] == "SOAP"
+    assert stats["framework"] == "Spyne"
+    assert stats["total_usuarios"] >= 0
+
+@pytest.mark.mutating
+def test_fast_path_matches_soap(soap_client):
+    """Test that the JSON fast-path returns the same user as SOAP"""
+    created_user = soap_client.service.criar_usuario(nome="Fast Path User", idade=33)
+    
+    response = _SESSION.get(f"{FAST_URL}/obter_usuario", params={"id_usuario": created_user.id})
+    assert response.status_code == 200
+    assert rjson(response) == {"id": created_user.id, "nome": "Fast Path User", "idade": 33}
+
+def test_fast_path_errors():
+    """Test fast-path error responses"""
+    assert _SESSION.get(f"{FAST_URL}/operacao_inexistente").status_code == 404
+    assert _SESSION.get(f"{FAST_URL}/obter_usuario").status_code == 400
+    response = _SESSION.get(f"{FAST_URL}/obter_usuario", params={"id_usuario": "nonexistent_id"})
+    assert response.status_code == 404
+    response = _SESSION.get(f"{FAST_URL}/listar_playlists_usuario", params={"id_usuario": "nonexistent_id"})
+    assert response.status_code == 404
+    response = _SESSION.get(f"{FAST_URL}/listar_musicas_playlist", params={"id_playlist": "nonexistent_id"})
+    assert response.status_code == 404
 
 if __name__ == "__main__":
     print("Starting SOAP service tests...")
     print("Make sure the SOAP service is running on http://localhost:8004")
-    print("Running tests in 5 seconds...")
-    time.sleep(5)  # Give time to read the message
-    
+    # Wait until the WSDL answers (at most 5 seconds) instead of a fixed pause
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            requests.get(BASE_URL, timeout=0.5)
+            break
+        except requests.RequestException:
+            time.sleep(0.1)
     # Run all tests
     pytest.main([__file__, "-v"])
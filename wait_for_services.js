@@ -1,5 +1,12 @@
 const http = require('http');
 
+// Shared keep-alive agent: successive polls reuse the same sockets
+const agent = new http.Agent({ keepAlive: true, maxSockets: 4 });
+
+// Poll backoff: short first waits catch services that are just finishing start-up
+const INITIAL_DELAY_MS = 100;
+const MAX_DELAY_MS = 2000;
+
 const services = [
     { name: 'REST API', port: 8000, path: '/docs' },
     { name: 'GraphQL API', port: 8001, path: '/graphql' },
@@ -13,10 +20,12 @@ function checkService(service) {
             port: service.port,
             path: service.path,
             method: 'GET',
+            agent,
             timeout: 5000  // Increased timeout to 5 seconds
         };
 
         const req = http.request(options, (res) => {
+            res.resume();  // drain the body so the socket returns to the pool
             if (res.statusCode >= 200 && res.statusCode < 500) {
                 console.log(`✅ ${service.name} is ready (Status: ${res.statusCode})`);
                 resolve(true);
@@ -47,9 +56,10 @@ function checkService(service) {
     });
 }
 
-async function waitForServices(maxAttempts = 30) {  // Added max attempts (30 * 2s = 60s max wait)
+async function waitForServices(maxAttempts = 30) {  // Added max attempts (~51s max wait with backoff)
     console.log('Waiting for services to be ready...');
     let attempts = 0;
+    let delay = INITIAL_DELAY_MS;
     
     while (attempts < maxAttempts) {
         console.log(`\nAttempt ${attempts + 1}/${maxAttempts}`);
@@ -60,8 +70,9 @@ async function waitForServices(maxAttempts = 30) {  // Added max attempts (30 *
         }
         attempts++;
         if (attempts < maxAttempts) {
-            console.log(`Waiting 2 seconds before next attempt...`);
-            await new Promise(resolve => setTimeout(resolve, 2000));
+            console.log(`Waiting ${delay}ms before next attempt...`);
+            await new Promise(resolve => setTimeout(resolve, delay));
+            delay = Math.min(delay * 2, MAX_DELAY_MS);
         }
     }
     